@@ -15,5 +15,11 @@ from src.ai_agents.utils import detect_language, get_language_instruction
 # Export planning agent functionality
 from src.ai_agents.planning_agent import generate_network_plan 
 
-# Export chat agent functionality
-from src.ai_agents.chat_agent import stream_chat_response 
\ No newline at end of file
+# Export chat agent functionality. chat_agent pulls in Google ADK and LiteLLM, which take
+# seconds to import, so it is loaded on first access instead of with the package: the
+# planning agents and services that only need the modules above do not pay for it
+def __getattr__(name):
+    if name == "stream_chat_response":
+        from src.ai_agents.chat_agent import stream_chat_response
+        return stream_chat_response
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
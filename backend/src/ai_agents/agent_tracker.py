@@ -1,15 +1,108 @@
+import asyncio
+import atexit
 import logging
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, field
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Deque, Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field, is_dataclass
 from datetime import datetime, timezone
-import json
+
+import orjson
+
+from src.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Сколько последних событий каждого типа держать в памяти; полная история пишется в лог-файл
+MAX_TRACKED_EVENTS = 1000
+# Трекеры без активности дольше этого времени удаляются из реестра
+TRACKER_TTL_SECONDS = 3600
+# Максимальное число трекеров в реестре; при переполнении вытесняются давно не использованные.
+# Ограничивает только память: трекеры не держат открытых файлов, логи пишет общий писатель
+MAX_TRACKERS = 10_000
+# Период фоновой очистки реестра
+TRACKER_SWEEP_INTERVAL_SECONDS = 300
+# Каталог для NDJSON-логов трассировки (вне ALLOWED_BASE_DIR, недоступен файловым инструментам агентов)
+TRACE_LOG_DIR = Path(settings.LOGS_DIR) / "traces"
+# Логи трассировки старше этого срока удаляются при фоновой очистке
+TRACE_LOG_RETENTION_SECONDS = 7 * 24 * 3600
+# Предельный общий размер логов трассировки; сверх него удаляются самые старые файлы
+TRACE_LOG_MAX_TOTAL_BYTES = 512 * 1024 * 1024
+
+def _format_timestamp_ns(timestamp_ns: int) -> str:
+    """Преобразовать timestamp в наносекундах (UTC epoch) в ISO-строку"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc).isoformat()
+
+class _TraceLogWriter:
+    """
+    Общий фоновый писатель NDJSON-логов всех трекеров.
+    Строки передаются через очередь одному потоку, который дописывает их пачками и
+    закрывает файл после каждой пачки: запись не блокирует event loop, данные попадают
+    на диск сразу, а открытым остается не больше одного файлового дескриптора.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[Tuple[Path, bytes]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._failed_dirs: set = set()
+
+    def write(self, path: Path, line: bytes) -> None:
+        """Поставить строку в очередь на запись в файл path"""
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="trace-log-writer", daemon=True)
+                    self._thread.start()
+        self._queue.put((path, line))
+
+    def flush(self) -> None:
+        """Дождаться записи всех поставленных в очередь строк"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines_by_path: Dict[Path, List[bytes]] = {}
+            for path, line in batch:
+                lines_by_path.setdefault(path, []).append(line)
+            for path, lines in lines_by_path.items():
+                self._append(path, b"".join(lines))
+            for _ in batch:
+                self._queue.task_done()
+
+    def _append(self, path: Path, data: bytes) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "ab") as f:
+                f.write(data)
+        except Exception as e:
+            # Ошибка записи трассировки не должна ломать агента; предупреждаем один раз на каталог
+            if path.parent not in self._failed_dirs:
+                self._failed_dirs.add(path.parent)
+                logger.warning(f"Failed to write trace log {path}: {e}")
+
+_trace_writer = _TraceLogWriter()
+atexit.register(_trace_writer.flush)
+
+def flush_trace_logs() -> None:
+    """Дождаться записи всех событий трассировки на диск"""
+    _trace_writer.flush()
+
 @dataclass
 class AgentActivity:
     """Класс для отслеживания активности агента"""
-    timestamp: str
+    timestamp_ns: int
     agent_name: str
     action_type: str
     description: str
@@ -17,10 +110,14 @@ class AgentActivity:
     success: bool = True
     error_message: Optional[str] = None
 
+    @property
+    def timestamp(self) -> str:
+        return _format_timestamp_ns(self.timestamp_ns)
+
 @dataclass
 class ToolCall:
     """Класс для отслеживания вызовов инструментов"""
-    timestamp: str
+    timestamp_ns: int
     tool_name: str
     parameters: Dict[str, Any] = field(default_factory=dict)
     result: Optional[str] = None
@@ -28,29 +125,65 @@ class ToolCall:
     error_message: Optional[str] = None
     execution_time_ms: Optional[float] = None
 
+    @property
+    def timestamp(self) -> str:
+        return _format_timestamp_ns(self.timestamp_ns)
+
 @dataclass
 class AgentTransfer:
     """Класс для отслеживания передач между агентами"""
-    timestamp: str
+    timestamp_ns: int
     from_agent: str
     to_agent: str
     reason: str
     context: Dict[str, Any] = field(default_factory=dict)
     confidence_score: Optional[float] = None
 
+    @property
+    def timestamp(self) -> str:
+        return _format_timestamp_ns(self.timestamp_ns)
+
 class AgentTracker:
     """Централизованный трекер активности агентов"""
     
     def __init__(self, task_id: str, session_id: str):
         self.task_id = task_id
         self.session_id = session_id
-        self.activities: List[AgentActivity] = []
-        self.tool_calls: List[ToolCall] = []
-        self.agent_transfers: List[AgentTransfer] = []
+        # В памяти хранятся только последние события, более старые остаются в лог-файле
+        self.activities: Deque[AgentActivity] = deque(maxlen=MAX_TRACKED_EVENTS)
+        self.tool_calls: Deque[ToolCall] = deque(maxlen=MAX_TRACKED_EVENTS)
+        self.agent_transfers: Deque[AgentTransfer] = deque(maxlen=MAX_TRACKED_EVENTS)
         self.start_time = datetime.now(timezone.utc)
+        # Время событий = одно чтение системных часов + монотонное смещение;
+        # ISO-строки строятся только при экспорте трассировки
+        self._t0_wall_ns = time.time_ns()
+        self._t0_mono_ns = time.perf_counter_ns()
+        self.last_activity_time = time.monotonic()
         self.current_agent = "Router"
         self.live_streaming_callbacks = []  # For real-time updates
+
+        # Накопительные счетчики, чтобы get_summary не пересматривал историю событий
+        self._activity_count = 0
+        self._activity_success = 0
+        self._transfer_count = 0
+        self._agents_used = {"Router"}
+        self._tool_stats: Dict[str, Dict[str, int]] = {}
+
+        safe_name = re.sub(r"[^\w.-]", "_", f"{task_id}_{session_id}")
+        self.log_path = TRACE_LOG_DIR / f"{safe_name}.jsonl"
         
+    def _write_log(self, event_type: str, event: Any) -> None:
+        """Дописать событие в NDJSON-лог сессии (запись выполняет общий фоновый писатель)"""
+        self.last_activity_time = time.monotonic()
+        try:
+            # orjson сериализует dataclass напрямую; тип события вставляется первым ключом
+            payload = orjson.dumps(event, default=str)
+        except Exception as e:
+            # Ошибка записи трассировки не должна ломать агента
+            logger.warning(f"Failed to serialize trace event for {self.log_path}: {e}")
+            return
+        _trace_writer.write(self.log_path, b'{"type":"' + event_type.encode() + b'",' + payload[1:] + b"\n")
+
     def add_live_streaming_callback(self, callback):
         """Add a callback function to receive real-time trace updates"""
         self.live_streaming_callbacks.append(callback)
@@ -63,16 +196,16 @@ class AgentTracker:
             except Exception as e:
                 logger.warning(f"Live streaming callback failed: {e}")
     
-    def _get_timestamp(self) -> str:
-        """Получить текущий timestamp"""
-        return datetime.now(timezone.utc).isoformat()
+    def _get_timestamp(self) -> int:
+        """Получить текущий timestamp (наносекунды UTC epoch, по монотонным часам)"""
+        return self._t0_wall_ns + (time.perf_counter_ns() - self._t0_mono_ns)
     
     def log_activity(self, agent_name: str, action_type: str, description: str, 
                     details: Optional[Dict[str, Any]] = None, success: bool = True, 
                     error_message: Optional[str] = None) -> None:
         """Логирование активности агента"""
         activity = AgentActivity(
-            timestamp=self._get_timestamp(),
+            timestamp_ns=self._get_timestamp(),
             agent_name=agent_name,
             action_type=action_type,
             description=description,
@@ -81,16 +214,20 @@ class AgentTracker:
             error_message=error_message
         )
         self.activities.append(activity)
-        logger.info(f"Agent Activity: {agent_name} - {action_type} - {description}")
+        self._activity_count += 1
+        self._activity_success += int(success)
+        self._write_log("activity", activity)
+        logger.info("Agent Activity: %s - %s - %s", agent_name, action_type, description)
         
-        # Notify live streaming callbacks
-        self._notify_live_update("activity", {
-            "agent_name": agent_name,
-            "action_type": action_type,
-            "description": description,
-            "success": success,
-            "timestamp": activity.timestamp
-        })
+        # Уведомить live streaming callbacks (payload строится, только если есть подписчики)
+        if self.live_streaming_callbacks:
+            self._notify_live_update("activity", {
+                "agent_name": agent_name,
+                "action_type": action_type,
+                "description": description,
+                "success": success,
+                "timestamp": activity.timestamp
+            })
     
     def log_tool_call(self, tool_name: str, parameters: Optional[Dict[str, Any]] = None,
                      result: Optional[str] = None, success: bool = True,
@@ -98,7 +235,7 @@ class AgentTracker:
                      execution_time_ms: Optional[float] = None) -> None:
         """Логирование вызова инструмента"""
         tool_call = ToolCall(
-            timestamp=self._get_timestamp(),
+            timestamp_ns=self._get_timestamp(),
             tool_name=tool_name,
             parameters=parameters or {},
             result=result,
@@ -107,22 +244,27 @@ class AgentTracker:
             execution_time_ms=execution_time_ms
         )
         self.tool_calls.append(tool_call)
-        logger.info(f"Tool Call: {tool_name} - {'Success' if success else 'Failed'}")
+        stats = self._tool_stats.setdefault(tool_name, {"count": 0, "success": 0})
+        stats["count"] += 1
+        stats["success"] += int(success)
+        self._write_log("tool_call", tool_call)
+        logger.info("Tool Call: %s - %s", tool_name, "Success" if success else "Failed")
         
-        # Notify live streaming callbacks
-        self._notify_live_update("tool_call", {
-            "tool_name": tool_name,
-            "success": success,
-            "execution_time_ms": execution_time_ms,
-            "timestamp": tool_call.timestamp
-        })
+        # Уведомить live streaming callbacks (payload строится, только если есть подписчики)
+        if self.live_streaming_callbacks:
+            self._notify_live_update("tool_call", {
+                "tool_name": tool_name,
+                "success": success,
+                "execution_time_ms": execution_time_ms,
+                "timestamp": tool_call.timestamp
+            })
     
     def log_agent_transfer(self, from_agent: str, to_agent: str, reason: str,
                           context: Optional[Dict[str, Any]] = None, 
                           confidence_score: Optional[float] = None) -> None:
         """Логирование передачи между агентами"""
         transfer = AgentTransfer(
-            timestamp=self._get_timestamp(),
+            timestamp_ns=self._get_timestamp(),
             from_agent=from_agent,
             to_agent=to_agent,
             reason=reason,
@@ -130,21 +272,27 @@ class AgentTracker:
             confidence_score=confidence_score
         )
         self.agent_transfers.append(transfer)
+        self._transfer_count += 1
+        self._agents_used.add(to_agent)
+        self._write_log("agent_transfer", transfer)
         self.current_agent = to_agent
-        logger.info(f"Agent Transfer: {from_agent} → {to_agent} (reason: {reason})")
+        logger.info("Agent Transfer: %s → %s (reason: %s)", from_agent, to_agent, reason)
         
-        # Notify live streaming callbacks
-        self._notify_live_update("agent_transfer", {
-            "from_agent": from_agent,
-            "to_agent": to_agent,
-            "reason": reason,
-            "confidence_score": confidence_score,
-            "timestamp": transfer.timestamp
-        })
+        # Уведомить live streaming callbacks (payload строится, только если есть подписчики)
+        if self.live_streaming_callbacks:
+            self._notify_live_update("agent_transfer", {
+                "from_agent": from_agent,
+                "to_agent": to_agent,
+                "reason": reason,
+                "confidence_score": confidence_score,
+                "timestamp": transfer.timestamp
+            })
     
     def get_summary(self) -> Dict[str, Any]:
         """Получить сводку по всей активности"""
         total_time = (datetime.now(timezone.utc) - self.start_time).total_seconds()
+        tool_call_count = sum(stats["count"] for stats in self._tool_stats.values())
+        tool_call_success = sum(stats["success"] for stats in self._tool_stats.values())
         
         return {
             "task_id": self.task_id,
@@ -152,14 +300,14 @@ class AgentTracker:
             "start_time": self.start_time.isoformat(),
             "total_time_seconds": total_time,
             "current_agent": self.current_agent,
-            "total_activities": len(self.activities),
-            "total_tool_calls": len(self.tool_calls),
-            "total_transfers": len(self.agent_transfers),
-            "agents_used": list(set([transfer.to_agent for transfer in self.agent_transfers] + ["Router"])),
-            "tools_used": list(set([call.tool_name for call in self.tool_calls])),
+            "total_activities": self._activity_count,
+            "total_tool_calls": tool_call_count,
+            "total_transfers": self._transfer_count,
+            "agents_used": list(self._agents_used),
+            "tools_used": list(self._tool_stats),
             "success_rate": {
-                "activities": sum(1 for a in self.activities if a.success) / len(self.activities) if self.activities else 1.0,
-                "tool_calls": sum(1 for t in self.tool_calls if t.success) / len(self.tool_calls) if self.tool_calls else 1.0
+                "activities": self._activity_success / self._activity_count if self._activity_count else 1.0,
+                "tool_calls": tool_call_success / tool_call_count if tool_call_count else 1.0
             }
         }
     
@@ -183,17 +331,9 @@ class AgentTracker:
             trace_lines.append("")
         
         # Tool calls
-        if self.tool_calls:
+        if self._tool_stats:
             trace_lines.append("🛠️ **Tools Used:**")
-            tool_summary = {}
-            for call in self.tool_calls:
-                if call.tool_name not in tool_summary:
-                    tool_summary[call.tool_name] = {"count": 0, "success": 0}
-                tool_summary[call.tool_name]["count"] += 1
-                if call.success:
-                    tool_summary[call.tool_name]["success"] += 1
-            
-            for tool, stats in tool_summary.items():
+            for tool, stats in self._tool_stats.items():
                 success_rate = stats["success"] / stats["count"]
                 status = "✅" if success_rate == 1.0 else "⚠️" if success_rate > 0.5 else "❌"
                 trace_lines.append(f"  • {status} {tool}: {stats['count']} calls ({stats['success']}/{stats['count']} successful)")
@@ -202,7 +342,7 @@ class AgentTracker:
         # Recent activities
         if self.activities:
             trace_lines.append("📝 **Recent Activities:**")
-            for activity in self.activities[-5:]:  # Show last 5 activities
+            for activity in list(self.activities)[-5:]:  # Show last 5 activities
                 status = "✅" if activity.success else "❌"
                 trace_lines.append(f"  • {status} [{activity.agent_name}] {activity.description}")
             trace_lines.append("")
@@ -228,25 +368,98 @@ class AgentTracker:
     
     def to_json(self) -> str:
         """Экспорт в JSON формат"""
-        return json.dumps({
+        # События передаются в _export_default, чтобы timestamp выгружался ISO-строкой, как раньше
+        return orjson.dumps({
             "summary": self.get_summary(),
-            "activities": [activity.__dict__ for activity in self.activities],
-            "tool_calls": [call.__dict__ for call in self.tool_calls],
-            "agent_transfers": [transfer.__dict__ for transfer in self.agent_transfers]
-        }, indent=2)
+            "activities": list(self.activities),
+            "tool_calls": list(self.tool_calls),
+            "agent_transfers": list(self.agent_transfers)
+        }, option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATACLASS, default=_export_default).decode()
 
-# Глобальный реестр трекеров
-_trackers: Dict[str, AgentTracker] = {}
+def _export_default(obj: Any) -> Any:
+    """Сериализация для orjson: события с ISO-полем timestamp вместо timestamp_ns, остальное строкой"""
+    if isinstance(obj, (AgentActivity, ToolCall, AgentTransfer)):
+        data = {"timestamp": obj.timestamp}
+        data.update((key, value) for key, value in obj.__dict__.items() if key != "timestamp_ns")
+        return data
+    if is_dataclass(obj):
+        return obj.__dict__
+    return str(obj)
+
+# Глобальный реестр трекеров (LRU: самые давно запрошенные трекеры в начале).
+# get_tracker вызывается и из рабочих потоков (create_chat_agent в asyncio.to_thread),
+# поэтому все изменения и обход реестра выполняются под _trackers_lock
+_trackers: "OrderedDict[str, AgentTracker]" = OrderedDict()
+_trackers_lock = threading.Lock()
+
+def evict_stale_trackers(ttl_seconds: float = TRACKER_TTL_SECONDS) -> int:
+    """Удалить трекеры без активности дольше ttl_seconds, вернуть их количество"""
+    cutoff = time.monotonic() - ttl_seconds
+    with _trackers_lock:
+        stale_keys = [key for key, tracker in list(_trackers.items()) if tracker.last_activity_time < cutoff]
+        for key in stale_keys:
+            del _trackers[key]
+    if stale_keys:
+        logger.info(f"Evicted {len(stale_keys)} stale agent trackers")
+    return len(stale_keys)
+
+def prune_trace_logs(retention_seconds: float = TRACE_LOG_RETENTION_SECONDS,
+                     max_total_bytes: int = TRACE_LOG_MAX_TOTAL_BYTES) -> int:
+    """
+    Удалить логи трассировки старше retention_seconds, а затем самые старые из оставшихся,
+    пока их общий размер больше max_total_bytes. Вернуть число удаленных файлов.
+    Файл активного трекера, если он был удален, создается заново при следующей записи.
+    """
+    entries = []
+    for path in TRACE_LOG_DIR.glob("*.jsonl"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    entries.sort(key=lambda entry: entry[0])
+    cutoff = time.time() - retention_seconds
+    total_bytes = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in entries:
+        if mtime >= cutoff and total_bytes <= max_total_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total_bytes -= size
+        removed += 1
+    if removed:
+        logger.info(f"Removed {removed} old trace logs")
+    return removed
+
+async def sweep_stale_trackers(interval_seconds: float = TRACKER_SWEEP_INTERVAL_SECONDS) -> None:
+    """Периодически удалять устаревшие трекеры и старые логи трассировки (фоновая задача приложения)"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            evict_stale_trackers()
+            # Обход каталога логов обращается к диску, поэтому выполняется в рабочем потоке
+            await asyncio.to_thread(prune_trace_logs)
+        except Exception as e:
+            logger.warning(f"Agent tracker sweep failed: {e}")
 
 def get_tracker(task_id: str, session_id: str) -> AgentTracker:
     """Получить или создать трекер для задачи"""
     key = f"{task_id}_{session_id}"
-    if key not in _trackers:
-        _trackers[key] = AgentTracker(task_id, session_id)
-    return _trackers[key]
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is not None:
+            _trackers.move_to_end(key)
+            return tracker
+
+        tracker = AgentTracker(task_id, session_id)
+        _trackers[key] = tracker
+        while len(_trackers) > MAX_TRACKERS:
+            _trackers.popitem(last=False)
+        return tracker
 
 def remove_tracker(task_id: str, session_id: str) -> None:
     """Удалить трекер"""
     key = f"{task_id}_{session_id}"
-    if key in _trackers:
-        del _trackers[key] 
\ No newline at end of file
+    with _trackers_lock:
+        _trackers.pop(key, None)
@@ -1,17 +1,27 @@
 import logging
-from typing import AsyncGenerator, List, Any, Optional, Dict
+from typing import AsyncGenerator, List, Any, Optional, Dict, TYPE_CHECKING
 import json 
 import time
-import pandas as pd
-import numpy as np
+import os
+import functools
+import hashlib
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
 from src.model.task import Task
 from src.ai_agents.utils import detect_language, get_language_instruction
 from src.ai_agents.tools.filesystem_tools import google_adk_filesystem_tools, create_tracked_filesystem_tools
 from src.ai_agents.tools.cognitive_tools import google_adk_cognitive_tools, create_tracked_cognitive_tools
 from src.ai_agents.tools.web_tools import google_adk_web_tools, create_tracked_web_tools
 from src.ai_agents.agent_tracker import get_tracker
+from src.ai_agents.llm import get_llm
 from src.core.config import settings
 
 # Google ADK imports
@@ -21,10 +31,226 @@ from google.adk.runners import Runner  # type: ignore
 from google.genai import types  # type: ignore
 from google.adk.memory import InMemoryMemoryService  # type: ignore
 from google.adk.tools import FunctionTool  # type: ignore
-from google.adk.models.lite_llm import LiteLlm
 
 logger = logging.getLogger(__name__)
 
+# pandas/numpy/pyarrow are heavy to import and only needed once a data tool actually runs,
+# so they are imported lazily via _get_pd_np(); here we only probe whether pyarrow exists
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+if not PYARROW_AVAILABLE:
+    logger.warning("pyarrow not installed. CSV loading will use the default pandas parser without parquet sidecars.")
+
+# Upper bound for charts rendered in parallel by create_data_visualizations_batch
+MAX_CHART_WORKERS = 4
+
+# Parquet copies of parsed CSV files; outside the workspaces, so the agent's file tools
+# and the user never see them next to their data
+CSV_CACHE_DIR = Path(settings.CACHE_DIR) / "csv"
+
+@functools.lru_cache(maxsize=1)
+def _get_pd_np():
+    """Imports pandas and numpy on first use and returns the (pd, np) modules."""
+    import pandas as pd
+    import numpy as np
+    return pd, np
+
+def _sidecar_prefix(file_path: str) -> str:
+    return hashlib.sha1(file_path.encode()).hexdigest()
+
+def _sidecar_path(file_path: str, mtime_ns: int, size: int) -> Path:
+    """
+    Returns the parquet sidecar path caching one version of a CSV file. The source's
+    (mtime, size) is part of the name, so a replaced file never matches the sidecar of
+    its previous contents, even if its mtime is older (cp -p, tar, git checkout).
+    """
+    return CSV_CACHE_DIR / f"{_sidecar_prefix(file_path)}_{mtime_ns}_{size}.parquet"
+
+def _write_sidecar(df: "pd.DataFrame", file_path: str, sidecar: Path) -> None:
+    """Writes the sidecar atomically and drops the ones left from older versions of the file."""
+    CSV_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    df.to_parquet(tmp_path, compression="zstd")
+    os.replace(tmp_path, sidecar)
+    for old in CSV_CACHE_DIR.glob(f"{_sidecar_prefix(file_path)}_*.parquet"):
+        if old != sidecar:
+            old.unlink(missing_ok=True)
+
+def _read_csv(file_path: str) -> "pd.DataFrame":
+    """
+    Parses a CSV file with the multi-threaded pyarrow engine, falling back to the default
+    parser for files pyarrow rejects (e.g. short rows, which the default parser pads with NaN).
+    """
+    pd, _ = _get_pd_np()
+    try:
+        return pd.read_csv(file_path, engine="pyarrow")
+    except ValueError as e:
+        logger.info(f"pyarrow could not parse {file_path} ({e}), using the default CSV parser")
+        return pd.read_csv(file_path)
+
+@functools.lru_cache(maxsize=8)
+def _load_df_cached(file_path: str, mtime_ns: int, size: int) -> "pd.DataFrame":
+    """
+    Loads a CSV file into a DataFrame. Cached on (path, mtime, size) so repeated
+    tool calls against an unchanged file do not re-parse it.
+    """
+    pd, _ = _get_pd_np()
+    if not PYARROW_AVAILABLE:
+        return pd.read_csv(file_path)
+
+    sidecar = _sidecar_path(file_path, mtime_ns, size)
+    try:
+        if sidecar.exists():
+            return pd.read_parquet(sidecar, engine="pyarrow", memory_map=True)
+    except Exception as e:
+        logger.warning(f"Failed to read parquet sidecar {sidecar}: {e}")
+
+    df = _read_csv(file_path)
+    try:
+        _write_sidecar(df, file_path, sidecar)
+    except Exception as e:
+        # The sidecar is only an optimization - a failed write must not break analysis
+        logger.warning(f"Failed to write parquet sidecar {sidecar}: {e}")
+    return df
+
+def _file_cache_key(file_path: str) -> tuple:
+    """Returns the (path, mtime, size) key identifying the current contents of a file."""
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size
+
+def _load_df(file_path: str) -> "pd.DataFrame":
+    """
+    Returns the DataFrame for a CSV file, reusing the cached parse while the file is unchanged.
+    The returned DataFrame is shared between calls and must not be modified in place.
+    """
+    return _load_df_cached(*_file_cache_key(file_path))
+
+@dataclass
+class _DFDescriptor:
+    """
+    Lazily computed descriptors of a DataFrame that several analysis types share.
+    Cached per file together with the DataFrame, so e.g. the null counts computed for
+    a 'statistical' analysis are reused by a following 'quality' analysis.
+    """
+    df: "pd.DataFrame"
+    _arrow_columns: Dict[Any, Any] = field(default_factory=dict, repr=False)
+
+    @functools.cached_property
+    def dtypes_dict(self) -> Dict[str, Any]:
+        return self.df.dtypes.to_dict()
+
+    @functools.cached_property
+    def numeric_cols(self) -> List[str]:
+        _, np = _get_pd_np()
+        return list(self.df.select_dtypes(include=[np.number]).columns)
+
+    @functools.cached_property
+    def null_counts(self) -> "pd.Series":
+        return self.df.isna().sum()
+
+    @functools.cached_property
+    def dup_count(self) -> int:
+        return int(self.df.duplicated().sum())
+
+    def arrow_column(self, col: Any) -> Optional["pa.Array"]:
+        """
+        Returns the column as a pyarrow array (zero-copy for Arrow-backed columns), or None
+        if pyarrow is missing or the column holds mixed types Arrow cannot represent.
+        """
+        if not PYARROW_AVAILABLE:
+            return None
+        if col not in self._arrow_columns:
+            import pyarrow as pa
+            try:
+                self._arrow_columns[col] = pa.array(self.df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                self._arrow_columns[col] = None
+        return self._arrow_columns[col]
+
+    def describe(self) -> "pd.DataFrame":
+        """
+        Equivalent of df.describe() for the numeric columns, computed with pyarrow.compute
+        kernels (multi-threaded, no intermediate pandas frames) when pyarrow is available.
+        """
+        if not PYARROW_AVAILABLE or not self.numeric_cols:
+            return self.df.describe()
+
+        import pyarrow.compute as pc
+        pd, _ = _get_pd_np()
+        stats = {}
+        for col in self.numeric_cols:
+            values = self.arrow_column(col)
+            min_max = pc.min_max(values)
+            quartiles = pc.quantile(values, q=[0.25, 0.5, 0.75]).to_pylist()
+            if len(quartiles) != 3:
+                quartiles = [None, None, None]
+            stats[col] = [
+                pc.count(values).as_py(),
+                pc.mean(values).as_py(),
+                pc.stddev(values, ddof=1).as_py(),
+                min_max["min"].as_py(),
+                *quartiles,
+                min_max["max"].as_py(),
+            ]
+        return pd.DataFrame(
+            stats,
+            index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"],
+            dtype="float64",
+        )
+
+    def nunique(self) -> Dict[str, int]:
+        """Number of distinct non-null values per column (df.nunique())."""
+        if not PYARROW_AVAILABLE:
+            return self.df.nunique().to_dict()
+
+        import pyarrow.compute as pc
+        result = {}
+        for col in self.df.columns:
+            values = self.arrow_column(col)
+            result[col] = pc.count_distinct(values).as_py() if values is not None else int(self.df[col].nunique())
+        return result
+
+    def whitespace_columns(self) -> List[Any]:
+        """
+        Returns the string columns that contain values with leading/trailing whitespace.
+        Arrow-convertible columns are compared with their Unicode-trimmed values in a single
+        kernel over the string buffers (so NBSP and U+3000 padding counts, as with
+        str.strip()); mixed object columns fall back to the pandas .str accessor. Object columns
+        without text (e.g. the datetime.date values the pyarrow parser makes of ISO dates)
+        are skipped.
+        """
+        pd, _ = _get_pd_np()
+        columns = []
+        for col in self.df.columns:
+            series = self.df[col]
+            if not pd.api.types.is_string_dtype(series.dtype):
+                continue
+            values = self.arrow_column(col)
+            if values is not None and _is_arrow_string(values.type):
+                import pyarrow.compute as pc
+                has_whitespace = pc.any(pc.not_equal(pc.utf8_trim_whitespace(values), values)).as_py()
+            elif pd.api.types.infer_dtype(series, skipna=True) in _TEXT_INFERRED_TYPES:
+                has_whitespace = series.str.contains(r"^\s|\s$", regex=True, na=False).any()
+            else:
+                continue
+            if has_whitespace:
+                columns.append(col)
+        return columns
+
+# Inferred types of object columns that may hold text and support the .str accessor
+_TEXT_INFERRED_TYPES = ("string", "mixed", "mixed-integer")
+
+def _is_arrow_string(arrow_type: Any) -> bool:
+    import pyarrow as pa
+    return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+
+@functools.lru_cache(maxsize=8)
+def _describe_df_cached(file_path: str, mtime_ns: int, size: int) -> _DFDescriptor:
+    return _DFDescriptor(_load_df_cached(file_path, mtime_ns, size))
+
+def _describe_df(file_path: str) -> _DFDescriptor:
+    """Returns the cached descriptor (and DataFrame) for a CSV file."""
+    return _describe_df_cached(*_file_cache_key(file_path))
+
 # Create specialized data analysis tools
 def analyze_csv_data(file_path: str, analysis_type: str = "overview") -> str:
     """
@@ -38,50 +264,50 @@ def analyze_csv_data(file_path: str, analysis_type: str = "overview") -> str:
         Analysis results as a string
     """
     try:
-        # Load the data
-        df = pd.read_csv(file_path)
+        # Load the data together with the descriptors shared by all analysis types
+        desc = _describe_df(file_path)
+        df = desc.df
         
         if analysis_type == "overview":
             result = f"""Data Overview for {file_path}:
 - Shape: {df.shape[0]} rows, {df.shape[1]} columns
 - Columns: {list(df.columns)}
-- Data types: {df.dtypes.to_dict()}
+- Data types: {desc.dtypes_dict}
 - Memory usage: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB
 - First 5 rows:
 {df.head().to_string()}
 """
         elif analysis_type == "statistical":
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
             result = f"""Statistical Analysis for {file_path}:
-- Numeric columns: {list(numeric_cols)}
+- Numeric columns: {desc.numeric_cols}
 - Summary statistics:
-{df.describe().to_string()}
-- Missing values: {df.isnull().sum().to_dict()}
+{desc.describe().to_string()}
+- Missing values: {desc.null_counts.to_dict()}
 """
         elif analysis_type == "patterns":
             result = f"""Pattern Analysis for {file_path}:
-- Unique values per column: {df.nunique().to_dict()}
-- Duplicate rows: {df.duplicated().sum()}
+- Unique values per column: {desc.nunique()}
+- Duplicate rows: {desc.dup_count}
 - Correlation matrix (numeric columns):
-{df.select_dtypes(include=[np.number]).corr().to_string()}
+{df[desc.numeric_cols].corr().to_string()}
 """
         elif analysis_type == "quality":
+            null_counts = desc.null_counts
+            dup_count = desc.dup_count
             result = f"""Data Quality Analysis for {file_path}:
-- Missing values: {df.isnull().sum().to_dict()}
-- Duplicate rows: {df.duplicated().sum()}
-- Data types consistency: {df.dtypes.to_dict()}
+- Missing values: {null_counts.to_dict()}
+- Duplicate rows: {dup_count}
+- Data types consistency: {desc.dtypes_dict}
 - Potential issues detected:
 """
             # Check for potential issues
             issues = []
-            if df.isnull().any().any():
+            if null_counts.any():
                 issues.append("- Contains missing values")
-            if df.duplicated().any():
+            if dup_count > 0:
                 issues.append("- Contains duplicate rows")
-            for col in df.columns:
-                if df[col].dtype == 'object':
-                    if df[col].str.strip().ne(df[col]).any():
-                        issues.append(f"- Column '{col}' has leading/trailing whitespace")
+            for col in desc.whitespace_columns():
+                issues.append(f"- Column '{col}' has leading/trailing whitespace")
             
             result += "\n".join(issues) if issues else "- No major issues detected"
         
@@ -90,6 +316,58 @@ def analyze_csv_data(file_path: str, analysis_type: str = "overview") -> str:
     except Exception as e:
         return f"Error analyzing CSV file {file_path}: {str(e)}"
 
+def _default_chart_path(file_path: str, chart_type: str, x_column: str, y_column: Optional[str] = None) -> str:
+    """Returns the output path of a chart saved without an explicit one."""
+    columns = f"{x_column}_{y_column}" if y_column else x_column
+    return f"{Path(file_path).stem}_{chart_type}_{columns}.png"
+
+def _render_chart(df: "pd.DataFrame", file_path: str, chart_type: str, x_column: str,
+                  y_column: Optional[str] = None, output_path: Optional[str] = None) -> str:
+    """Draws one chart from an already loaded DataFrame and saves it, returning the output path."""
+    # Explicit Figure + Agg canvas instead of pyplot: no global figure state shared
+    # between concurrent agent sessions and no GUI backend involved
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    
+    if chart_type == "histogram":
+        ax.hist(df[x_column], bins=30, alpha=0.7)
+        ax.set_xlabel(x_column)
+        ax.set_ylabel("Frequency")
+        ax.set_title(f"Histogram of {x_column}")
+        
+    elif chart_type == "scatter" and y_column:
+        ax.scatter(df[x_column], df[y_column], alpha=0.7)
+        ax.set_xlabel(x_column)
+        ax.set_ylabel(y_column)
+        ax.set_title(f"Scatter plot: {x_column} vs {y_column}")
+        
+    elif chart_type == "line" and y_column:
+        ax.plot(df[x_column], df[y_column])
+        ax.set_xlabel(x_column)
+        ax.set_ylabel(y_column)
+        ax.set_title(f"Line plot: {x_column} vs {y_column}")
+        
+    elif chart_type == "bar":
+        counts = df[x_column].value_counts()
+        ax.bar(counts.index.astype(str), counts.to_numpy())
+        ax.tick_params(axis="x", labelrotation=90)
+        ax.set_xlabel(x_column)
+        ax.set_ylabel("Count")
+        ax.set_title(f"Bar chart of {x_column}")
+    
+    if not output_path:
+        output_path = _default_chart_path(file_path, chart_type, x_column, y_column)
+    
+    # Lay out once and render once (bbox_inches='tight' would trigger a second render);
+    # 150 dpi is plenty for charts viewed on screen
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150)
+    return output_path
+
 def create_data_visualization(file_path: str, chart_type: str, x_column: str, y_column: Optional[str] = None, output_path: Optional[str] = None) -> str:
     """
     Creates data visualizations and saves them as files.
@@ -105,49 +383,65 @@ def create_data_visualization(file_path: str, chart_type: str, x_column: str, y_
         Status message
     """
     try:
-        import matplotlib.pyplot as plt
-        import seaborn as sns
-        
-        df = pd.read_csv(file_path)
-        
-        plt.figure(figsize=(10, 6))
-        
-        if chart_type == "histogram":
-            plt.hist(df[x_column], bins=30, alpha=0.7)
-            plt.xlabel(x_column)
-            plt.ylabel("Frequency")
-            plt.title(f"Histogram of {x_column}")
-            
-        elif chart_type == "scatter" and y_column:
-            plt.scatter(df[x_column], df[y_column], alpha=0.7)
-            plt.xlabel(x_column)
-            plt.ylabel(y_column)
-            plt.title(f"Scatter plot: {x_column} vs {y_column}")
-            
-        elif chart_type == "line" and y_column:
-            plt.plot(df[x_column], df[y_column])
-            plt.xlabel(x_column)
-            plt.ylabel(y_column)
-            plt.title(f"Line plot: {x_column} vs {y_column}")
-            
-        elif chart_type == "bar":
-            df[x_column].value_counts().plot(kind='bar')
-            plt.xlabel(x_column)
-            plt.ylabel("Count")
-            plt.title(f"Bar chart of {x_column}")
-        
-        if not output_path:
-            output_path = f"{Path(file_path).stem}_{chart_type}_{x_column}.png"
-        
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        
+        df = _load_df(file_path)
+        output_path = _render_chart(df, file_path, chart_type, x_column, y_column, output_path)
         return f"Chart saved to {output_path}"
         
     except Exception as e:
         return f"Error creating visualization: {str(e)}"
 
+def create_data_visualizations_batch(file_path: str, specs: List[Dict[str, Any]]) -> str:
+    """
+    Creates several charts from the same data file in one call.
+    
+    Args:
+        file_path: Path to the data file
+        specs: Chart specifications, each with 'chart_type', 'x_column' and optional
+               'y_column' and 'output_path' (same meaning as in create_data_visualization)
+    
+    Returns:
+        Status message with one line per chart
+    """
+    try:
+        df = _load_df(file_path)
+    except Exception as e:
+        return f"Error creating visualizations: {str(e)}"
+    
+    # Charts are rendered in parallel, so two specs saving to the same file would silently
+    # overwrite each other; only the first one of them is rendered
+    claimed_paths = set()
+    jobs = []
+    for spec in specs:
+        try:
+            output_path = spec.get("output_path") or _default_chart_path(
+                file_path, spec["chart_type"], spec["x_column"], spec.get("y_column"))
+        except Exception as e:
+            jobs.append((spec, None, f"Error creating visualization {spec}: {str(e)}"))
+            continue
+        resolved = os.path.abspath(output_path)
+        if resolved in claimed_paths:
+            jobs.append((spec, None, f"Error creating visualization {spec}: output path {output_path} is used by another chart"))
+            continue
+        claimed_paths.add(resolved)
+        jobs.append((spec, output_path, None))
+    
+    def render(job) -> str:
+        spec, output_path, error = job
+        if error:
+            return error
+        try:
+            _render_chart(df, file_path, spec["chart_type"], spec["x_column"],
+                          spec.get("y_column"), output_path)
+            return f"Chart saved to {output_path}"
+        except Exception as e:
+            return f"Error creating visualization {spec}: {str(e)}"
+    
+    # The file is parsed once; every chart gets its own Figure, so the Agg renders
+    # can run side by side without sharing any pyplot state
+    with ThreadPoolExecutor(max_workers=max(1, min(len(specs), MAX_CHART_WORKERS))) as executor:
+        results = list(executor.map(render, jobs))
+    return "\n".join(results) if results else "No charts requested"
+
 def perform_data_research(topic: str, data_sources: Optional[List[str]] = None) -> str:
     """
     Performs research on a data-related topic using web search and analysis.
@@ -180,22 +474,21 @@ def tracked_analyze_csv_data(file_path: str, analysis_type: str = "overview", ta
     """Analyzed CSV data with tracking."""
     tracker = get_tracker(task_id, session_id) if task_id and session_id else None
     
-    if tracker:
-        tracker.log_tool_call("analyze_csv_data", {"file_path": file_path, "analysis_type": analysis_type})
-    
+    params = {"file_path": file_path, "analysis_type": analysis_type}
+    start_time = time.perf_counter()
     try:
         result = analyze_csv_data(file_path, analysis_type)
         if tracker:
-            tracker.log_tool_call("analyze_csv_data", 
-                                {"file_path": file_path, "analysis_type": analysis_type}, 
+            execution_time = (time.perf_counter() - start_time) * 1000
+            tracker.log_tool_call("analyze_csv_data", params, 
                                 result=result[:200] + "..." if len(result) > 200 else result, 
-                                success=True)
+                                success=True, execution_time_ms=execution_time)
         return result
     except Exception as e:
         if tracker:
-            tracker.log_tool_call("analyze_csv_data", 
-                                {"file_path": file_path, "analysis_type": analysis_type}, 
-                                success=False, error_message=str(e))
+            execution_time = (time.perf_counter() - start_time) * 1000
+            tracker.log_tool_call("analyze_csv_data", params, 
+                                success=False, error_message=str(e), execution_time_ms=execution_time)
         raise
 
 def tracked_create_data_visualization(file_path: str, chart_type: str, x_column: str, 
@@ -205,17 +498,36 @@ def tracked_create_data_visualization(file_path: str, chart_type: str, x_column:
     tracker = get_tracker(task_id, session_id) if task_id and session_id else None
     
     params = {"file_path": file_path, "chart_type": chart_type, "x_column": x_column, "y_column": y_column}
-    if tracker:
-        tracker.log_tool_call("create_data_visualization", params)
-    
+    start_time = time.perf_counter()
     try:
         result = create_data_visualization(file_path, chart_type, x_column, y_column, output_path)
         if tracker:
-            tracker.log_tool_call("create_data_visualization", params, result=result, success=True)
+            execution_time = (time.perf_counter() - start_time) * 1000
+            tracker.log_tool_call("create_data_visualization", params, result=result, success=True, execution_time_ms=execution_time)
         return result
     except Exception as e:
         if tracker:
-            tracker.log_tool_call("create_data_visualization", params, success=False, error_message=str(e))
+            execution_time = (time.perf_counter() - start_time) * 1000
+            tracker.log_tool_call("create_data_visualization", params, success=False, error_message=str(e), execution_time_ms=execution_time)
+        raise
+
+def tracked_create_data_visualizations_batch(file_path: str, specs: List[Dict[str, Any]],
+                                            task_id: Optional[str] = None, session_id: Optional[str] = None) -> str:
+    """Creates several data visualizations with tracking."""
+    tracker = get_tracker(task_id, session_id) if task_id and session_id else None
+    
+    params = {"file_path": file_path, "specs": specs}
+    start_time = time.perf_counter()
+    try:
+        result = create_data_visualizations_batch(file_path, specs)
+        if tracker:
+            execution_time = (time.perf_counter() - start_time) * 1000
+            tracker.log_tool_call("create_data_visualizations_batch", params, result=result, success=True, execution_time_ms=execution_time)
+        return result
+    except Exception as e:
+        if tracker:
+            execution_time = (time.perf_counter() - start_time) * 1000
+            tracker.log_tool_call("create_data_visualizations_batch", params, success=False, error_message=str(e), execution_time_ms=execution_time)
         raise
 
 def tracked_perform_data_research(topic: str, data_sources: Optional[List[str]] = None,
@@ -224,17 +536,17 @@ def tracked_perform_data_research(topic: str, data_sources: Optional[List[str]]
     tracker = get_tracker(task_id, session_id) if task_id and session_id else None
     
     params = {"topic": topic, "data_sources": data_sources}
-    if tracker:
-        tracker.log_tool_call("perform_data_research", params)
-    
+    start_time = time.perf_counter()
     try:
         result = perform_data_research(topic, data_sources)
         if tracker:
-            tracker.log_tool_call("perform_data_research", params, result=result[:200] + "..." if len(result) > 200 else result, success=True)
+            execution_time = (time.perf_counter() - start_time) * 1000
+            tracker.log_tool_call("perform_data_research", params, result=result[:200] + "..." if len(result) > 200 else result, success=True, execution_time_ms=execution_time)
         return result
     except Exception as e:
         if tracker:
-            tracker.log_tool_call("perform_data_research", params, success=False, error_message=str(e))
+            execution_time = (time.perf_counter() - start_time) * 1000
+            tracker.log_tool_call("perform_data_research", params, success=False, error_message=str(e), execution_time_ms=execution_time)
         raise
 
 async def create_autonomous_data_agent(task: Task, workspace_path: str) -> Agent:
@@ -258,12 +570,16 @@ async def create_autonomous_data_agent(task: Task, workspace_path: str) -> Agent
                                                       y_column: Optional[str] = None, output_path: Optional[str] = None) -> str:
             return tracked_create_data_visualization(file_path, chart_type, x_column, y_column, output_path, task_str, session_str)
         
+        def tracked_create_data_visualizations_batch_for_task(file_path: str, specs: List[Dict[str, Any]]) -> str:
+            return tracked_create_data_visualizations_batch(file_path, specs, task_str, session_str)
+        
         def tracked_perform_data_research_for_task(topic: str, data_sources: Optional[List[str]] = None) -> str:
             return tracked_perform_data_research(topic, data_sources, task_str, session_str)
         
         return [
             tracked_analyze_csv_data_for_task,
             tracked_create_data_visualization_for_task,
+            tracked_create_data_visualizations_batch_for_task,
             tracked_perform_data_research_for_task
         ]
     
@@ -310,6 +626,7 @@ async def create_autonomous_data_agent(task: Task, workspace_path: str) -> Agent
 **Guidelines**:
 - Always start with data quality assessment
 - Create appropriate visualizations for insights
+- When you need several charts from the same file, create them in one create_data_visualizations_batch call
 - Use statistical methods when relevant
 - Research context for better interpretation
 - Document your analysis process
@@ -326,7 +643,7 @@ Be proactive, thorough, and insightful in your data analysis approach."""
 
     agent = Agent(
         name="autonomous_data_agent",
-        model=LiteLlm(model=f"openai/{settings.OPENAI_MODEL}"),
+        model=get_llm(f"openai/{settings.OPENAI_MODEL}"),
         instruction=instruction,
         tools=all_tools
     )
@@ -360,7 +677,7 @@ async def stream_data_analysis_response(task: Task, user_message: str, workspace
         )
         
         # Create session
-        session = session_service.create_session(
+        session = await session_service.create_session(
             app_name=settings.PROJECT_NAME,
             user_id=f"data_agent_{task.id}",
             session_id=session_id or f"data_session_{task.id}",
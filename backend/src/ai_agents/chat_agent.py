@@ -1,28 +1,28 @@
+import asyncio
+import functools
 import logging
-from typing import AsyncGenerator, List, Any, Optional
-import json 
+import reprlib
+from typing import AsyncGenerator, AsyncIterator, Callable, Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
 import time
 
 from src.model.task import Task
 from src.ai_agents.utils import detect_language, get_language_instruction
-from src.ai_agents.tools.filesystem_tools import google_adk_filesystem_tools, create_tracked_filesystem_tools
-from src.ai_agents.tools.cognitive_tools import google_adk_cognitive_tools, create_tracked_cognitive_tools
-from src.ai_agents.tools.web_tools import google_adk_web_tools, create_tracked_web_tools
+from src.ai_agents.llm import get_llm
+from src.ai_agents.tools.cognitive_tools import create_tracked_cognitive_tools
+from src.ai_agents.tools.web_tools import create_tracked_web_tools
 from src.ai_agents.tools.task_management_tools import create_tracked_task_management_tools
-from src.ai_agents.executor_agent import create_executor_agent
 from src.core.config import settings
 from src.ai_agents.agent_tracker import get_tracker
 
 # Google ADK imports
 from google.adk.agents import Agent  # type: ignore
-from google.adk.sessions import InMemorySessionService  # type: ignore
+from google.adk.sessions import InMemorySessionService, Session  # type: ignore
 from google.adk.runners import Runner  # type: ignore
+from google.adk.agents.run_config import RunConfig, StreamingMode  # type: ignore
 from google.genai import types  # type: ignore
 from google.adk.memory import InMemoryMemoryService  # type: ignore
-from google.adk.tools import load_memory  # type: ignore
-from google.adk.tools import FunctionTool  # type: ignore
-from google.adk.tools.base_tool import BaseTool  # type: ignore
-from google.adk.models.lite_llm import LiteLlm
+from src.ai_agents.tools.cached_function_tool import wrap_tools
 
 # ExecutorAgent tools
 from src.ai_agents.executor_agent import (  # type: ignore
@@ -43,11 +43,6 @@ from src.ai_agents.intent_understanding_tools import create_intent_understanding
 # NEW: Add task execution tools for comprehensive task management
 from src.ai_agents.task_execution_tools import create_task_execution_tools
 
-# Add new imports for workspace management
-import os
-import uuid
-from pathlib import Path
-
 logger = logging.getLogger(__name__)
 
 # Create a shared session service that persists across requests
@@ -55,34 +50,110 @@ logger = logging.getLogger(__name__)
 _session_service = InMemorySessionService()
 _memory_service = InMemoryMemoryService()
 
-def create_workspace_for_task(task_id: str) -> str:
+# Sessions known to exist are remembered for a short time, so the following turns
+# of a chat skip the session service lookup, see get_or_create_session()
+SESSION_CACHE_TTL_SECONDS = 60.0
+MAX_CACHED_SESSIONS = 1024
+_session_cache: "OrderedDict[Tuple[str, str], Tuple[Session, float]]" = OrderedDict()
+# Locks of the chat sessions currently being looked up or created, see get_or_create_session()
+class _SessionLock:
+    """An asyncio.Lock with the number of turns holding or waiting for it."""
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+_session_locks: Dict[Tuple[str, str], _SessionLock] = {}
+
+# Workspace paths of recently active tasks, see create_workspace_for_task()
+MAX_CACHED_WORKSPACES = 1024
+_workspace_paths: "OrderedDict[str, str]" = OrderedDict()
+
+# Instruction of each chat session with the language instruction and task lines it was
+# built for, see get_session_instruction()
+MAX_CACHED_INSTRUCTIONS = 1024
+_session_instructions: "OrderedDict[Tuple[str, str], Tuple[str, str, str]]" = OrderedDict()
+
+# Chat turns being written to the workspace history in the background; the tasks are
+# referenced here until they finish so they are not garbage collected
+_pending_session_saves: "set[asyncio.Task]" = set()
+
+# Ask the model for server-sent events so text reaches the client as it is generated
+STREAMING_RUN_CONFIG = RunConfig(streaming_mode=StreamingMode.SSE)
+
+# A streamed chunk waits at most this long for later chunks to be sent with it,
+# and the batch is flushed early once the buffered text reaches the size limit
+STREAM_BATCH_WINDOW_SECONDS = 0.02
+STREAM_BATCH_MAX_CHARS = 512
+# Chunks the agent may produce ahead of the client before generation is paused
+STREAM_QUEUE_MAX_CHUNKS = 64
+_STREAM_END = object()
+
+# User messages are cloned from these templates: model_copy skips the pydantic
+# validation that building Content and Part from scratch runs on every message
+_USER_CONTENT_TEMPLATE = types.Content(role='user', parts=[])
+_USER_PART_TEMPLATE = types.Part(text="")
+
+# Progress lines streamed while the agent calls tools
+_TOOLS_HEADER = "\n🛠️ **Tools Used:** (real-time as tools are called ✅)\n"
+_TOOL_CALL_FMT = "  • 🔄 %s (executing...)\n"
+_TOOL_DONE_FMT = "  • ✅ %s (completed)\n"
+
+# Known failures are reported with a fixed, user-friendly message; the first
+# marker found in the lower-cased error text selects it
+CHAT_ERROR_MESSAGES = (
+    ("session not found", "⚠️ Error: Your chat session has expired. Please reset the chat to continue."),
+    ("timeout", "⚠️ Error: The request timed out. Please try again."),
+    ("authentication", "⚠️ Error: Authentication failed. Please check your credentials."),
+    ("unauthorized", "⚠️ Error: Authentication failed. Please check your credentials."),
+)
+
+# Chat runners (with their agent and tools) cached per (task_id, session_id), see get_chat_runner()
+MAX_CHAT_RUNNERS = 256
+CHAT_RUNNER_TTL_SECONDS = 600.0
+_chat_runners: "OrderedDict[Tuple[str, str], Tuple[Runner, float]]" = OrderedDict()
+
+# Tool results are only previewed in the trace. reprlib cuts long strings and large
+# containers before formatting them, so a multi-KB tool payload is never stringified
+# in full just to keep its first characters
+TOOL_RESULT_PREVIEW_CHARS = 100
+_tool_result_repr = reprlib.Repr()
+_tool_result_repr.maxstring = TOOL_RESULT_PREVIEW_CHARS
+_tool_result_repr.maxother = TOOL_RESULT_PREVIEW_CHARS
+
+def format_tool_result_preview(result: Any) -> str:
+    """Returns a short preview of a tool result for the agent tracker."""
+    if result is None:
+        return "No response"
+    return _tool_result_repr.repr(result)[:TOOL_RESULT_PREVIEW_CHARS]
+
+async def create_workspace_for_task(task_id: str) -> str:
     """
     Creates or returns persistent workspace directory for the task.
     NO MORE RANDOM SUFFIXES! One workspace per task, persistent across sessions.
     
     This is a major improvement inspired by Manus AI and Cursor AI patterns.
+    The path is cached per task, so only the first message of a task touches the disk,
+    and that directory setup runs in a worker thread to keep the event loop free.
     """
-    workspace_manager = get_workspace_manager()
-    workspace_path = workspace_manager.create_or_get_workspace(task_id)
+    workspace_path = _workspace_paths.get(task_id)
+    if workspace_path is not None:
+        _workspace_paths.move_to_end(task_id)
+        return workspace_path
     
-    # Load existing context if available
-    context = workspace_manager.load_context(task_id)
-    if context:
-        logger.info(f"Loaded existing context for task {task_id}: {len(context)} components")
+    workspace_manager = get_workspace_manager()
+    workspace_path = await asyncio.to_thread(workspace_manager.create_or_get_workspace, task_id)
+    _workspace_paths[task_id] = workspace_path
+    if len(_workspace_paths) > MAX_CACHED_WORKSPACES:
+        _workspace_paths.popitem(last=False)
     
-    logger.info(f"Using persistent workspace for task {task_id}: {workspace_path}")
+    logger.info("Using persistent workspace for task %s: %s", task_id, workspace_path)
     return workspace_path
 
-def get_enhanced_instruction(task: Task, workspace_path: str) -> str:
-    """
-    Creates an enhanced instruction that gives the agent more autonomy and capabilities.
-    Now includes persistent workspace context for continuity across sessions.
-    """
-    # Load workspace context
-    workspace_manager = get_workspace_manager()
-    context_summary = workspace_manager.get_context_summary(str(task.id))
-    
-    base_instruction = f"""You are an advanced AI assistant with autonomous capabilities, similar to Claude Code. You have access to a dedicated PERSISTENT workspace and comprehensive tools to help users with complex tasks.
+# The instruction is ~8 KB of static text around a few per-task values, so the
+# template is assembled once at import and filled with a single str.format per request
+ENHANCED_INSTRUCTION_TEMPLATE = """{language_prefix}You are an advanced AI assistant with autonomous capabilities, similar to Claude Code. You have access to a dedicated PERSISTENT workspace and comprehensive tools to help users with complex tasks.
 
 **PERSISTENT WORKSPACE CONTEXT**:
 {context_summary}
@@ -106,16 +177,7 @@ def get_enhanced_instruction(task: Task, workspace_path: str) -> str:
 - Save important findings and progress to workspace files
 
 **Task Context**:
-- Task ID: {task.id}"""
-
-    if task.task:
-        base_instruction += f"\n- Task: {task.task}"
-    if task.short_description:
-        base_instruction += f"\n- Description: {task.short_description}"
-    if task.state:
-        base_instruction += f"\n- State: {task.state.value if hasattr(task.state, 'value') else task.state}"
-
-    base_instruction += """
+- Task ID: {task_id}{task_details}
 
 **INTELLIGENT TASK MANAGEMENT:**
 You have special tools to analyze and manage the current task's structure:
@@ -240,7 +302,234 @@ You now have comprehensive task execution capabilities with full lifecycle manag
 - Result fields include execution summary, artifacts created, validation results
 """
 
-    return base_instruction
+def get_enhanced_instruction(task: Task, workspace_path: str, language_instruction: str = "") -> str:
+    """
+    Creates an enhanced instruction that gives the agent more autonomy and capabilities.
+    Now includes persistent workspace context for continuity across sessions.
+    The language instruction, if any, is placed before it in the same format call.
+    """
+    # Load workspace context
+    workspace_manager = get_workspace_manager()
+    context_summary = workspace_manager.get_context_summary(str(task.id))
+    
+    return ENHANCED_INSTRUCTION_TEMPLATE.format(
+        language_prefix=f"{language_instruction}\n\n" if language_instruction else "",
+        context_summary=context_summary,
+        workspace_path=workspace_path,
+        task_id=task.id,
+        task_details=_task_lines(task)
+    )
+
+def _task_lines(task: Task) -> str:
+    """Returns the task lines of the instruction for the current task fields."""
+    state = task.state.value if hasattr(task.state, 'value') else task.state
+    return format_task_details(task.task, task.short_description, state)
+
+async def get_session_instruction(task: Task, session_id: str, workspace_path: str, language_instruction: str = "") -> str:
+    """
+    Returns the instruction of a chat session. It is built on the first turn and kept
+    as is for the following ones, so the prompt prefix sent to the model stays identical
+    and the provider's prompt cache keeps matching; the workspace context is written to
+    disk live and re-read when the session is reset or the user switches language.
+    A message without a detected language (no language instruction) keeps the session's
+    instruction, so short replies like "ok" do not flip a non-English prompt back.
+    The task lines (text, description, state) are checked on every turn: an edit of the
+    task, including one made by the chat's own tools, rebuilds the whole instruction, so
+    the model never works from a stale task at the cost of one prompt cache miss and a
+    fresh read of the workspace context.
+    Reading the workspace context touches the disk, so it runs in a worker thread.
+    """
+    key = (str(task.id), session_id)
+    task_details = _task_lines(task)
+    cached = _session_instructions.get(key)
+    if (cached is not None and cached[1] == task_details
+            and (cached[0] == language_instruction or not language_instruction)):
+        _session_instructions.move_to_end(key)
+        return cached[2]
+    
+    instruction = await asyncio.to_thread(get_enhanced_instruction, task, workspace_path, language_instruction)
+    _session_instructions[key] = (language_instruction, task_details, instruction)
+    _session_instructions.move_to_end(key)
+    if len(_session_instructions) > MAX_CACHED_INSTRUCTIONS:
+        _session_instructions.popitem(last=False)
+    return instruction
+
+@functools.lru_cache(maxsize=512)
+def format_task_details(task_text: Optional[str], short_description: Optional[str], state: Optional[str]) -> str:
+    """
+    Formats the task lines of the instruction. Cached on the field values, so consecutive
+    turns on an unchanged task reuse the string while any edit produces a fresh one.
+    """
+    details = []
+    if task_text:
+        details.append(f"\n- Task: {task_text}")
+    if short_description:
+        details.append(f"\n- Description: {short_description}")
+    if state:
+        details.append(f"\n- State: {state}")
+    return "".join(details)
+
+async def get_chat_runner(task_id: str, session_id: str, instruction: str) -> Runner:
+    """
+    Returns the ADK runner for a task session, creating it and its agent on first use.
+    The tools are bound to the task and session, so a cached agent only needs the
+    latest instruction. Runners idle for CHAT_RUNNER_TTL_SECONDS are dropped, as are the
+    least recently used ones beyond MAX_CHAT_RUNNERS. A new agent and its ~50 tools are
+    built in a worker thread, so other chats keep streaming meanwhile.
+    """
+    now = time.monotonic()
+    # Entries are kept in last-use order, so the expired ones are at the front
+    while _chat_runners:
+        oldest_key, (_, last_used) = next(iter(_chat_runners.items()))
+        if now - last_used < CHAT_RUNNER_TTL_SECONDS:
+            break
+        del _chat_runners[oldest_key]
+    
+    key = (task_id, session_id)
+    cached = _chat_runners.get(key)
+    if cached is not None:
+        runner = cached[0]
+        runner.agent.instruction = instruction
+    else:
+        agent = await asyncio.to_thread(create_chat_agent, task_id, session_id, instruction)
+        runner = Runner(
+            agent=agent,
+            app_name=settings.PROJECT_NAME,
+            session_service=_session_service
+        )
+    _chat_runners[key] = (runner, now)
+    _chat_runners.move_to_end(key)
+    if len(_chat_runners) > MAX_CHAT_RUNNERS:
+        _chat_runners.popitem(last=False)
+    return runner
+
+async def get_or_create_session(user_id: str, session_id: str, state: Dict[str, Any]) -> Session:
+    """
+    Returns the ADK session of a chat, creating it with the given initial state if it
+    does not exist yet. Sessions are cached for SESSION_CACHE_TTL_SECONDS after a lookup.
+    """
+    key = (user_id, session_id)
+    cached = _cached_session(key)
+    if cached is not None:
+        return cached
+
+    # Concurrent turns of the same chat resolve the session one at a time, so a missing
+    # session is created only once. The lock is dropped once no turn holds or waits for
+    # it; checking lock.locked() would not do, as it is False while a woken waiter has
+    # not taken the lock yet
+    session_lock = _session_locks.get(key)
+    if session_lock is None:
+        session_lock = _session_locks[key] = _SessionLock()
+    session_lock.users += 1
+    try:
+        async with session_lock.lock:
+            # Another turn may have resolved the session while this one was waiting
+            cached = _cached_session(key)
+            if cached is not None:
+                return cached
+
+            session = await _session_service.get_session(
+                app_name=settings.PROJECT_NAME,
+                user_id=user_id,
+                session_id=session_id
+            )
+            if session is None:
+                session = await _session_service.create_session(
+                    app_name=settings.PROJECT_NAME,
+                    user_id=user_id,
+                    session_id=session_id,
+                    state=state
+                )
+                # A new session starts from the current workspace context
+                _session_instructions.pop(key, None)
+                logger.info("Created new session: %s", session.id)
+            else:
+                logger.info("Found existing session: %s", session.id)
+
+            _session_cache[key] = (session, time.monotonic())
+            _session_cache.move_to_end(key)
+            if len(_session_cache) > MAX_CACHED_SESSIONS:
+                _session_cache.popitem(last=False)
+            return session
+    finally:
+        session_lock.users -= 1
+        if session_lock.users == 0:
+            del _session_locks[key]
+
+def _cached_session(key: Tuple[str, str]) -> Optional[Session]:
+    cached = _session_cache.get(key)
+    if cached is None or time.monotonic() - cached[1] >= SESSION_CACHE_TTL_SECONDS:
+        return None
+    _session_cache.move_to_end(key)
+    return cached[0]
+
+def forget_session(user_id: str, session_id: str) -> None:
+    """
+    Drops a chat session from the lookup and instruction caches, e.g. after it was
+    deleted or reset.
+    """
+    _session_cache.pop((user_id, session_id), None)
+    _session_instructions.pop((user_id, session_id), None)
+
+def create_chat_agent(task_id: str, session_id: str, instruction: str) -> Agent:
+    """
+    Creates the ADK chat agent with all tools bound to the task session.
+    """
+    # Combine all available tools for the agent
+    all_tools = []
+
+    # Add workspace-aware tools for proper directory scoping
+    all_tools.extend(create_workspace_aware_tools(task_id, session_id))
+
+    # Add intent understanding tools for better user interaction
+    all_tools.extend(create_intent_understanding_tools(task_id, session_id))
+
+    # Add task execution tools for comprehensive task management
+    all_tools.extend(create_task_execution_tools(task_id, session_id))
+
+    # Add cognitive tools (for analysis and planning) with tracking
+    all_tools.extend(create_tracked_cognitive_tools(task_id, session_id))
+
+    # Add web tools (for research and information gathering) with tracking
+    all_tools.extend(create_tracked_web_tools(task_id, session_id))
+
+    # Add task management tools
+    all_tools.extend(create_tracked_task_management_tools(task_id, session_id))
+
+    # Add workspace management tools for persistent workspace interaction
+    all_tools.extend(create_workspace_management_tools(task_id, session_id))
+
+    # Add database tools for querying and comparing workspace state with database state
+    all_tools.extend(create_tracked_database_tools(task_id, session_id))
+
+    # Create executor agent tools for delegation
+    executor_tools = create_tracked_executor_tools(task_id, session_id)
+
+    # Add executor functions directly (they should already be simple functions)
+    all_tools.extend(executor_tools)
+
+    # Create the ADK agent with OpenAI model via LiteLLM and all tools
+    agent = Agent(
+        name="autonomous_task_assistant",
+        model=get_llm(f"openai/{settings.OPENAI_MODEL}"),  # Use the shared LiteLlm wrapper for OpenAI
+        instruction=instruction,
+        tools=wrap_tools(all_tools)  # Provide all available tools, wrapped once for this agent
+    )
+    return agent
+
+@functools.lru_cache(maxsize=1)
+def get_router_stream() -> Optional[Callable[..., AsyncGenerator[str, None]]]:
+    """
+    Returns the intelligent router's streaming entry point, or None if the router cannot
+    be imported. router_agent imports this module, so the router is resolved on first
+    use rather than at module load; either outcome is cached.
+    """
+    try:
+        from src.ai_agents.router_agent import stream_intelligent_router_response
+    except ImportError as e:
+        logger.warning(f"Router agent not available: {e}. Falling back to basic chat agent.")
+        return None
+    return stream_intelligent_router_response
 
 async def stream_chat_response(task: Task, user_message: str, message_history: Optional[List[Any]] = None, session_id: Optional[str] = None) -> AsyncGenerator[str, None]:
     """
@@ -257,237 +546,286 @@ async def stream_chat_response(task: Task, user_message: str, message_history: O
     Yields:
         Chunks of the response as they are generated
     """
-    logger.info(f"Starting intelligent chat response for task {task.id} with session_id: {session_id}")
+    logger.info("Starting intelligent chat response for task %s with session_id: %s", task.id, session_id)
 
     # Use the task_id as default session_id if none provided
     effective_session_id = session_id or f"session_{task.id}"
     
-    # Accumulate response for saving to workspace
-    accumulated_response = ""
+    # Collect response chunks for saving to workspace (joined once at the end)
+    response_parts: List[str] = []
 
     # Use intelligent routing system
+    stream_intelligent_router_response = get_router_stream()
     try:
-        from src.ai_agents.router_agent import stream_intelligent_router_response
-        async for content in stream_intelligent_router_response(task, user_message, effective_session_id):
-            accumulated_response += content
-            yield content
-    except ImportError as e:
-        logger.warning(f"Router agent not available: {e}. Falling back to basic chat agent.")
-        # Fallback to basic chat agent if router is not available
-        async for content in stream_chat_with_agent_sdk(task, user_message, message_history, effective_session_id):
-            accumulated_response += content
-            yield content
+        if stream_intelligent_router_response is not None:
+            async for content in stream_intelligent_router_response(task, user_message, effective_session_id):
+                response_parts.append(content)
+                yield content
     except Exception as e:
-        logger.error(f"Error in intelligent routing: {e}. Falling back to basic chat agent.")
-        # Fallback to basic chat agent on any error
+        # The traceback is logged so router bugs stay visible behind the fallback
+        logger.error(f"Error in intelligent routing: {e}. Falling back to basic chat agent.", exc_info=True)
+        stream_intelligent_router_response = None
+    
+    # Fallback to basic chat agent if router is not available or fails
+    if stream_intelligent_router_response is None:
         async for content in stream_chat_with_agent_sdk(task, user_message, message_history, effective_session_id):
-            accumulated_response += content
+            response_parts.append(content)
             yield content
     
-    # Save session to persistent workspace
+    # Save session to persistent workspace in a worker thread, so the stream ends
+    # without waiting for the disk write
+    workspace_manager = get_workspace_manager()
+    save = asyncio.create_task(asyncio.to_thread(
+        workspace_manager.save_session,
+        task_id=str(task.id),
+        user_message=user_message,
+        agent_response="".join(response_parts),
+        session_id=effective_session_id
+    ))
+    _pending_session_saves.add(save)
+    save.add_done_callback(_finish_session_save)
+
+def _finish_session_save(save: asyncio.Task) -> None:
+    _pending_session_saves.discard(save)
+    # Don't fail the request if saving fails, the error is only logged
+    if not save.cancelled() and save.exception() is not None:
+        logger.error(f"Failed to save session to workspace: {save.exception()}")
+
+def build_user_content(text: str) -> types.Content:
+    """
+    Returns the ADK content for a user message.
+    """
+    part = _USER_PART_TEMPLATE.model_copy(update={"text": text})
+    return _USER_CONTENT_TEMPLATE.model_copy(update={"parts": [part]})
+
+def format_chat_error(error: Exception) -> str:
+    """
+    Returns the message shown to the user when the chat stream fails.
+    """
+    error_text = str(error)
+    error_message = error_text.lower()
+    for marker, message in CHAT_ERROR_MESSAGES:
+        if marker in error_message:
+            return message
+    return f"⚠️ Error: {error_text}"
+
+async def coalesce_stream(
+    chunks: AsyncIterator[str],
+    window_seconds: float = STREAM_BATCH_WINDOW_SECONDS,
+    max_chars: int = STREAM_BATCH_MAX_CHARS,
+) -> AsyncGenerator[str, None]:
+    """
+    Re-emits a chunk stream in batches: a batch is flushed `window_seconds` after its
+    first chunk arrived, or as soon as it holds `max_chars`, so a steady token stream
+    is still delivered every window instead of only when the size limit is reached.
+    The source is consumed by a separate task, so the model keeps generating while
+    the client drains earlier chunks; the bounded queue pauses it when the client
+    falls STREAM_QUEUE_MAX_CHUNKS behind.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_MAX_CHUNKS)
+
+    async def produce() -> None:
+        # Not a finally: a cancelled producer must not block on a full queue
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+        except Exception:
+            await queue.put(_STREAM_END)
+            raise
+        await queue.put(_STREAM_END)
+
+    loop = asyncio.get_running_loop()
+    producer = asyncio.create_task(produce())
+    buffer: List[str] = []
+    buffered_chars = 0
+    flush_at = 0.0
     try:
-        workspace_manager = get_workspace_manager()
-        workspace_manager.save_session(
-            task_id=str(task.id),
-            user_message=user_message,
-            agent_response=accumulated_response,
-            session_id=effective_session_id
-        )
-        logger.info(f"Saved session to persistent workspace for task {task.id}")
-    except Exception as e:
-        logger.error(f"Failed to save session to workspace: {e}")
-        # Don't fail the entire request if saving fails
+        while True:
+            if buffer:
+                try:
+                    chunk = await asyncio.wait_for(queue.get(), timeout=max(0.0, flush_at - loop.time()))
+                except asyncio.TimeoutError:
+                    yield "".join(buffer)
+                    buffer.clear()
+                    buffered_chars = 0
+                    continue
+            else:
+                chunk = await queue.get()
+            if chunk is _STREAM_END:
+                break
+            if not buffer:
+                flush_at = loop.time() + window_seconds
+            buffer.append(chunk)
+            buffered_chars += len(chunk)
+            if buffered_chars >= max_chars:
+                yield "".join(buffer)
+                buffer.clear()
+                buffered_chars = 0
+        if buffer:
+            yield "".join(buffer)
+        # Surface an exception raised by the source
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+
 
 async def stream_chat_with_agent_sdk(task: Task, user_message: str, message_history: Optional[List[Any]] = None, session_id: Optional[str] = None) -> AsyncGenerator[str, None]:
     """
     Streams chat response using Google ADK's Agent streaming API.
     This implementation maintains conversation history between requests through session_service.
+    Chunks are coalesced with coalesce_stream() so the client is not flushed once per token.
+    """
+    async for chunk in coalesce_stream(_stream_agent_events(task, user_message, session_id)):
+        yield chunk
+
+
+async def _stream_agent_events(task: Task, user_message: str, session_id: Optional[str] = None) -> AsyncGenerator[str, None]:
+    """
+    Runs the ADK agent for one user message and yields its output event by event.
     """
     user_id = task.id  # Task ID will be used as user ID
+    task_id = str(task.id)
     
     # Generate a session ID if one wasn't provided
     if not session_id:
-        session_id = f"session_{task.id}"
+        session_id = f"session_{task_id}"
     
-    logger.info(f"Using session_id: {session_id} for chat with task {task.id}")
+    logger.info("Using session_id: %s for chat with task %s", session_id, task_id)
     
     # Create workspace for this task
-    workspace_path = create_workspace_for_task(str(task.id))
+    workspace_path = await create_workspace_for_task(task_id)
     
-    # Detect language and create appropriate instruction
+    # Detect language for the instruction
     user_language = detect_language(user_message)
     language_instruction = get_language_instruction(user_language)
-    
-    # Build the enhanced instruction with workspace and capabilities
-    full_instruction = get_enhanced_instruction(task, workspace_path)
-    
-    # Apply language preference
-    if language_instruction:
-        full_instruction = f"{language_instruction}\n\n{full_instruction}"
 
     # Create the content for the user message
-    content = types.Content(role='user', parts=[types.Part(text=user_message)])
+    content = build_user_content(user_message)
     
     try:
-        # Ensure session exists - Fixed approach: handle synchronous session service
-        session = None
-        try:
-            # Try to get the existing session first
-            session = _session_service.get_session(
-                app_name=settings.PROJECT_NAME,
-                user_id=user_id,
-                session_id=session_id
-            )
-            # Check if session is None (no exception thrown, just returns None)
-            if session is None:
-                raise Exception("Session not found")
-            logger.info(f"Found existing session: {session.id}")
-        except Exception as e:
-            # Session doesn't exist, create it synchronously (no await needed!)
-            logger.info(f"Creating new session, error was: {e}")
-            # Create session synchronously - this was the key fix!
-            session = _session_service.create_session(
-                app_name=settings.PROJECT_NAME,
-                user_id=user_id,
-                session_id=session_id,
-                state={"workspace_path": workspace_path, "task_id": str(task.id)}  # Store workspace info in session
-            )
-            logger.info(f"Created new session: {session.id}")
-            # Use the session_id we provided
-            session_id = session.id
-
-        # Combine all available tools for the agent
-        all_tools = []
-        
-        # Add tracked tools for enhanced monitoring
-        # Ensure session_id is a string
-        effective_session_id = session_id or f"session_{task.id}"
-        tracker = get_tracker(str(task.id), effective_session_id)
-        
-        # Add workspace-aware tools for proper directory scoping
-        all_tools.extend(create_workspace_aware_tools(str(task.id), effective_session_id))
-        
-        # Add intent understanding tools for better user interaction
-        all_tools.extend(create_intent_understanding_tools(str(task.id), effective_session_id))
-        
-        # Add task execution tools for comprehensive task management
-        all_tools.extend(create_task_execution_tools(str(task.id), effective_session_id))
-        
-        # Add cognitive tools (for analysis and planning) with tracking
-        all_tools.extend(create_tracked_cognitive_tools(str(task.id), effective_session_id))
-        
-        # Add web tools (for research and information gathering) with tracking
-        all_tools.extend(create_tracked_web_tools(str(task.id), effective_session_id))
-        
-        # Add task management tools - Google ADK auto-wraps functions as FunctionTool
-        all_tools.extend(create_tracked_task_management_tools(str(task.id), effective_session_id))
-        
-        # Add workspace management tools for persistent workspace interaction
-        all_tools.extend(create_workspace_management_tools(str(task.id), effective_session_id))
-        
-        # Add database tools for querying and comparing workspace state with database state
-        all_tools.extend(create_tracked_database_tools(str(task.id), effective_session_id))
-        
-        # Create executor agent tools for delegation
-        executor_tools = create_tracked_executor_tools(str(task.id), effective_session_id)
-        
-        # Add executor functions directly (they should already be simple functions)
-        all_tools.extend(executor_tools)
-
-        # Create the ADK agent with OpenAI model via LiteLLM and all tools
-        agent = Agent(
-            name="autonomous_task_assistant",
-            model=LiteLlm(model=f"openai/{settings.OPENAI_MODEL}"),  # Use LiteLlm wrapper for OpenAI
-            instruction=full_instruction,
-            tools=all_tools  # Provide all available tools
+        # Ensure session exists, storing workspace info in a new session
+        session = await get_or_create_session(
+            user_id,
+            session_id,
+            state={"workspace_path": workspace_path, "task_id": task_id}
         )
+        session_id = session.id
+        tracker = get_tracker(task_id, session_id)
         
-        # Create the runner with the agent and session service
-        runner = Runner(
-            agent=agent,
-            app_name=settings.PROJECT_NAME,
-            session_service=_session_service
-        )
+        # Build the enhanced instruction with workspace, capabilities and language preference
+        # once per session, see get_session_instruction()
+        full_instruction = await get_session_instruction(task, session_id, workspace_path, language_instruction)
+        
+        # Reuse the ADK runner, agent and tools built for this task session
+        runner = await get_chat_runner(task_id, session_id, full_instruction)
         
         # Run and stream using ADK with the confirmed session ID
-        logger.info(f"Starting autonomous agent with session_id: {session_id}, workspace: {workspace_path}")
+        logger.info("Starting autonomous agent with session_id: %s, workspace: %s", session_id, workspace_path)
         
-        # Variables for tracking streaming state
-        agent_response_accumulator = ""
+        # Variables for tracking streaming state; the text itself is only streamed, all
+        # that is kept is whether any of it was more than whitespace
+        has_text = False
+        text_chars = 0
         tools_displayed = False
+        partial_text_streamed = False
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         
-        async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=content):
-            # Track event details for debugging
-            logger.debug(f"ADK Event: author={getattr(event, 'author', 'unknown')}, "
-                        f"partial={getattr(event, 'partial', None)}, "
-                        f"has_content={bool(event.content)}, "
-                        f"is_final={event.is_final_response()}")
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=content,
+            run_config=STREAMING_RUN_CONFIG,
+        ):
+            # Partial events are streamed text deltas: they never carry tool calls and never
+            # end the run, so only their text is read
+            is_partial = bool(event.partial)
+            is_final = not is_partial and event.is_final_response()
+            
+            # Track event details for debugging (the message is only built when DEBUG is on)
+            if debug_enabled:
+                logger.debug("ADK Event: author=%s, partial=%s, has_content=%s, is_final=%s",
+                             event.author, event.partial, bool(event.content), is_final)
+            
+            # ADK events, function calls and parts are typed models, so their fields are read
+            # directly instead of being probed with hasattr/getattr on every streamed event,
+            # and the content parts are loaded once per event
             
-            # Handle Function Calls (Tool Requests) - Display immediately
-            function_calls = event.get_function_calls() if hasattr(event, 'get_function_calls') else []
-            if function_calls:
-                if not tools_displayed:
-                    yield f"\n🛠️ **Tools Used:** (real-time as tools are called ✅)\n"
-                    tools_displayed = True
+            # Everything produced for one event is available at the same moment, so it is
+            # sent as a single chunk instead of one yield per line
+            event_chunks = []
+            
+            if not is_partial:
+                # Handle Function Calls (Tool Requests) - Display immediately
+                function_calls = event.get_function_calls()
+                if function_calls:
+                    if not tools_displayed:
+                        event_chunks.append(_TOOLS_HEADER)
+                        tools_displayed = True
                 
-                for call in function_calls:
-                    tool_name = getattr(call, 'name', 'unknown_tool')
-                    yield f"  • 🔄 {tool_name} (executing...)\n"
+                    for call in function_calls:
+                        tool_name = call.name or 'unknown_tool'
+                        event_chunks.append(_TOOL_CALL_FMT % tool_name)
                     
-                    # Log tool call in tracker
-                    tracker.log_tool_call(
-                        tool_name=tool_name,
-                        parameters=getattr(call, 'args', {}),
-                        success=True,  # Initial call is successful, will be updated if there's an error
-                        execution_time_ms=None
-                    )
+                        # Log tool call in tracker
+                        tracker.log_tool_call(
+                            tool_name=tool_name,
+                            parameters=call.args or {},
+                            success=True,  # Initial call is successful, will be updated if there's an error
+                            execution_time_ms=None
+                        )
             
-            # Handle Function Responses (Tool Results) - Display results
-            function_responses = event.get_function_responses() if hasattr(event, 'get_function_responses') else []
-            if function_responses:
-                for response in function_responses:
-                    tool_name = getattr(response, 'name', 'unknown_tool')
-                    success = True  # Assume success if we got a response
+                # Handle Function Responses (Tool Results) - Display results
+                function_responses = event.get_function_responses()
+                if function_responses:
+                    for response in function_responses:
+                        tool_name = response.name or 'unknown_tool'
+                        success = True  # Assume success if we got a response
                     
-                    # Update the tool call status in display
-                    yield f"  • ✅ {tool_name} (completed)\n"
+                        # Update the tool call status in display
+                        event_chunks.append(_TOOL_DONE_FMT % tool_name)
                     
-                    # Update tracker with results
-                    tracker.log_tool_call(
-                        tool_name=tool_name,
-                        result=str(getattr(response, 'response', 'No response'))[:100],
-                        success=success
-                    )
+                        # Update tracker with results
+                        tracker.log_tool_call(
+                            tool_name=tool_name,
+                            result=format_tool_result_preview(response.response),
+                            success=success
+                        )
+            
+            # Handle Text Content - Stream as it comes. Partial events carry only the new
+            # text; the closing non-partial event repeats the whole message, so its text
+            # is skipped when the deltas were already sent
+            if is_partial:
+                partial_text_streamed = True
+                text_already_streamed = False
+            else:
+                text_already_streamed = partial_text_streamed
+                partial_text_streamed = False
+            event_parts = event.content.parts if event.content else None
+            if event_parts and not text_already_streamed:
+                for part in event_parts:
+                    if part.text:
+                        text_chars += len(part.text)
+                        if not has_text and not part.text.isspace():
+                            has_text = True
+                        event_chunks.append(part.text)
             
-            # Handle Text Content - Stream as it comes
-            if event.content and event.content.parts:
-                for part in event.content.parts:
-                    if hasattr(part, 'text') and part.text:
-                        text_chunk = part.text
-                        agent_response_accumulator += text_chunk
-                        
-                        # Yield the text chunk immediately for real-time streaming
-                        yield text_chunk
+            # Stream this event's output as soon as it is complete
+            if event_chunks:
+                yield "".join(event_chunks)
             
-            # Check if this is the final response
-            if event.is_final_response():
-                logger.debug(f"Final response detected, accumulated text length: {len(agent_response_accumulator)}")
-                # Final response reached - end the stream
-                if not agent_response_accumulator.strip():
-                    yield "\n\n✅ Task completed."
-                return
+            # Final response reached - stop reading events
+            if is_final:
+                break
+        
+        if debug_enabled:
+            logger.debug("Agent run finished, streamed text length: %d", text_chars)
+        if not has_text:
+            yield "\n\n✅ Task completed."
 
     # Error handling with better session error detection
     except Exception as e:
         logger.error(f"Error in Agent SDK chat streaming: {str(e)}", exc_info=True)
         
         # Handle specific session errors by providing helpful message
-        error_message = str(e).lower()
-        if "session not found" in error_message:
-            yield "⚠️ Error: Your chat session has expired. Please reset the chat to continue."
-        elif "timeout" in error_message:
-            yield "⚠️ Error: The request timed out. Please try again."
-        elif "authentication" in error_message or "unauthorized" in error_message:
-            yield "⚠️ Error: Authentication failed. Please check your credentials."
-        else:
-            yield f"⚠️ Error: {str(e)}"
\ No newline at end of file
+        yield format_chat_error(e)
\ No newline at end of file
@@ -1,6 +1,6 @@
 import logging
 from src.core.config import settings
-from src.model.context import ContextSufficiencyResult 
+from src.model.context import ContextSufficiencyResult, ContextQuestion
 from src.model.task import Task
 from src.ai_agents.utils import detect_language, get_language_instruction
 
@@ -13,40 +13,43 @@ except ImportError:
     logger.warning("OpenAI Agents SDK not installed. Some functionality will be limited.")
     AGENTS_SDK_AVAILABLE = False
 
-async def analyze_context_sufficiency(
-    task: Task,
-    iteration_count: int = 0
-) -> ContextSufficiencyResult:
-    """
-    Uses OpenAI Agent SDK to determine if the gathered context is sufficient.
-    
-    Args:
-        task: The task containing the context information
-        
-    Returns:
-        ContextSufficiencyResult: Result indicating if context is sufficient and any follow-up questions
-    """
-    if not AGENTS_SDK_AVAILABLE:
-        logger.error("OpenAI Agents SDK not installed.")
-        raise ImportError("OpenAI Agents SDK not installed. Please install with `pip install openai-agents`")
-    
-    # Detect language from task description
-    task_description = task.short_description or ""
-    user_language = detect_language(task_description)
-    
-    # Get language-specific instruction
-    language_instruction = get_language_instruction(user_language)
-    
-    # Format the context answers if available
-    context_answers_text = ""
-    if task.context_answers:
-        context_answers_text = "\n".join([
-            f"Q: {answer.question}\nA: {answer.answer}" 
-            for answer in task.context_answers
-        ])
-    
-    # Create the instruction for the agent
-    instructions = f"""
+# Requests shorter than this (in words) with no context at all are answered with the
+# generic fallback questions - there is nothing for the LLM to analyze yet
+MIN_WORDS_FOR_ANALYSIS = 8
+# With at least this many non-empty answers and a detailed description the context is
+# considered sufficient without another LLM round-trip
+MIN_ANSWERS_FOR_SUFFICIENT = 3
+MIN_WORDS_FOR_SUFFICIENT = 40
+# Chinese and Japanese are written without spaces, so their requests are measured in
+# characters against these thresholds instead
+_CHARACTER_COUNTED_LANGUAGES = {"zh", "ja"}
+MIN_CHARS_FOR_ANALYSIS = 15
+MIN_CHARS_FOR_SUFFICIENT = 80
+# Only the latest answers are sent to the LLM so the prompt does not grow with the session
+MAX_CONTEXT_ANSWERS_IN_PROMPT = 20
+
+_FALLBACK_QUESTIONS = {
+    "en": [
+        ("What is the main goal you want to achieve?",
+         ["Solve a specific problem", "Build a product or tool", "Learn or research a topic", "Plan an event or project"]),
+        ("What scale do you have in mind?",
+         ["Personal use", "Small team", "Organization-wide", "Public product"]),
+        ("What is your time frame?",
+         ["Days", "Weeks", "Months", "No fixed deadline"]),
+    ],
+    "ru": [
+        ("Какую главную цель вы хотите достичь?",
+         ["Решить конкретную проблему", "Создать продукт или инструмент", "Изучить или исследовать тему", "Спланировать мероприятие или проект"]),
+        ("Какой масштаб вы предполагаете?",
+         ["Для личного использования", "Небольшая команда", "Вся организация", "Публичный продукт"]),
+        ("Какие у вас сроки?",
+         ["Дни", "Недели", "Месяцы", "Без жёсткого срока"]),
+    ],
+}
+
+# Static instructions keep the system prompt identical across calls, so the agent is
+# built once and the provider can reuse the cached prompt prefix
+CONTEXT_SUFFICIENCY_INSTRUCTIONS = """
     This is an initial interaction with the user, so treat it as user has:
      - a problem that should be converted into a task or
      - idea/task that should be clarified, like more "crystallized".
@@ -58,10 +61,10 @@ async def analyze_context_sufficiency(
     - MODERATE REQUESTS (technical ideas, business tasks): Ask 3-5 focused questions
     - COMPLEX REQUESTS (multi-disciplinary, regulatory, high-stakes): Ask 5-7 detailed questions
 
-    ITERATION LIMIT: Current iteration count is {iteration_count}.
+    ITERATION LIMIT: The message states the current ITERATION COUNT and MAX QUESTIONS for this iteration.
     - If iteration count >= 3: Be very conservative, ask at most 2 questions, prioritize only critical gaps
     - If iteration count >= 5: Consider context sufficient unless there are critical missing elements
-    - Do not ask more than {max(1, 5 - iteration_count)} questions in this iteration.
+    - Do not ask more than MAX QUESTIONS questions in this iteration.
 
     If the context is insufficient, provide questions to gather more information.
     Each question should be specific and focused on resolving ambiguities or filling gaps.
@@ -79,10 +82,80 @@ async def analyze_context_sufficiency(
     with excessive detail unless the request clearly requires deep technical/regulatory analysis.
     """
 
+if AGENTS_SDK_AVAILABLE:
+    context_sufficiency_agent = Agent(
+        name="ContextSufficiencyAgent",
+        instructions=CONTEXT_SUFFICIENCY_INSTRUCTIONS,
+        output_type=ContextSufficiencyResult,
+        model=model
+    )
+
+def get_fallback_result(language: str = "en") -> ContextSufficiencyResult:
+    """
+    Returns generic clarifying questions for a request that is too short to analyze.
+    Only en and ru are localized, other languages get the English questions.
+    """
+    questions = _FALLBACK_QUESTIONS.get(language, _FALLBACK_QUESTIONS["en"])
+    return ContextSufficiencyResult(
+        is_context_sufficient=False,
+        questions=[ContextQuestion(question=question, options=options) for question, options in questions]
+    )
+
+async def analyze_context_sufficiency(
+    task: Task,
+    iteration_count: int = 0
+) -> ContextSufficiencyResult:
+    """
+    Uses OpenAI Agent SDK to determine if the gathered context is sufficient.
+    
+    Args:
+        task: The task containing the context information
+        
+    Returns:
+        ContextSufficiencyResult: Result indicating if context is sufficient and any follow-up questions
+    """
+    # Detect language from task description
+    task_description = task.short_description or ""
+    user_language = detect_language(task_description)
+
+    # Degenerate cases are decided locally without an LLM round-trip
+    request_text = task.task or task.short_description or ""
+    if user_language in _CHARACTER_COUNTED_LANGUAGES:
+        request_length = len("".join(request_text.split()))
+        min_for_analysis, min_for_sufficient = MIN_CHARS_FOR_ANALYSIS, MIN_CHARS_FOR_SUFFICIENT
+    else:
+        request_length = len(request_text.split())
+        min_for_analysis, min_for_sufficient = MIN_WORDS_FOR_ANALYSIS, MIN_WORDS_FOR_SUFFICIENT
+    answered_count = sum(1 for answer in task.context_answers or [] if answer.answer and answer.answer.strip())
+    # Without localized fallback questions the LLM asks in the user's language instead
+    if (user_language in _FALLBACK_QUESTIONS and not (task.context or "").strip()
+            and not task.context_answers and request_length < min_for_analysis):
+        logger.info(f"Task {task.id}: request too short for analysis, returning fallback questions")
+        return get_fallback_result(user_language)
+    if answered_count >= MIN_ANSWERS_FOR_SUFFICIENT and request_length > min_for_sufficient:
+        logger.info(f"Task {task.id}: {answered_count} answers on a detailed request, context is sufficient")
+        return ContextSufficiencyResult(is_context_sufficient=True, questions=[])
+
+    if not AGENTS_SDK_AVAILABLE:
+        logger.error("OpenAI Agents SDK not installed.")
+        raise ImportError("OpenAI Agents SDK not installed. Please install with `pip install openai-agents`")
+    
+    # Get language-specific instruction
+    language_instruction = get_language_instruction(user_language)
+    
+    # Format the most recent context answers, older ones only repeat history
+    context_answers_text = "\n".join(
+        f"Q: {answer.question}\nA: {answer.answer}"
+        for answer in (task.context_answers or [])[-MAX_CONTEXT_ANSWERS_IN_PROMPT:]
+    )
+    
     # Construct the message with dynamic data
     message_content = f"""
     Analyze the following task and context information:
 
+    ITERATION COUNT: {iteration_count}
+    MAX QUESTIONS: {max(1, 5 - iteration_count)}
+    ---
     INITITAL USER INPUT (TASK): {task.short_description}
     ---
     CONTEXT ANSWERS: {context_answers_text}
@@ -92,18 +165,9 @@ async def analyze_context_sufficiency(
     """
     
     logger.info(f"Analyzing context sufficiency for the task {task.id}")
-    # logger.info(f"Analysis instructions: {instructions}")
     logger.info(f"---> REQUEST OPENAI **ContextSufficiencyAgent** ({user_language}) with message: {message_content}")
-    # Create the agent
-    agent = Agent(
-        name="ContextSufficiencyAgent",
-        instructions=instructions,
-        output_type=ContextSufficiencyResult,
-        model=model
-    )
-    
     # Run the agent
-    result = await Runner.run(agent, message_content)
+    result = await Runner.run(context_sufficiency_agent, message_content)
     
     # Process the response
     result = result.final_output
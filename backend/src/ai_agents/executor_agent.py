@@ -1,5 +1,6 @@
 import logging
 import time
+import functools
 from src.model.task import Task
 from src.model.subtask import Subtask
 from src.model.status import StatusEnum
@@ -10,7 +11,8 @@ logger = logging.getLogger(__name__)
 
 # Import Pydantic for type handling
 from pydantic import BaseModel, ConfigDict
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
 
 # Try to import the OpenAI Agents SDK
 try:
@@ -36,6 +38,7 @@ except ImportError:
 
 # Import Agent from Google ADK
 from google.adk.agents import Agent  # type: ignore
+from src.ai_agents.tools.cached_function_tool import CachedFunctionTool
 from google.adk.tools.tool_context import ToolContext  # type: ignore
 from google.adk.tools.base_tool import BaseTool  # type: ignore
 # Import InMemoryArtifactService for binary data handling
@@ -74,6 +77,24 @@ def _update_subtask_in_database(task: Task, subtask_id: str, operation: str) ->
         logger.error(error_msg, exc_info=True)
         return False, error_msg
 
+# Serialized task JSON cached by (task id, updated_at). The executor tools change a task only
+# through DatabaseService.updated_task, which bumps updated_at and so invalidates the entry
+MAX_TASK_CONTEXT_CACHE = 64
+_task_context_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+def _get_task_context_json(task: Task) -> str:
+    """Returns task.model_dump_json(), reusing the result until the task is updated."""
+    key = (task.id, task.updated_at)
+    task_json = _task_context_cache.get(key)
+    if task_json is None:
+        task_json = task.model_dump_json()
+        _task_context_cache[key] = task_json
+        if len(_task_context_cache) > MAX_TASK_CONTEXT_CACHE:
+            _task_context_cache.popitem(last=False)
+    else:
+        _task_context_cache.move_to_end(key)
+    return task_json
+
 # --- Executor Agent Tools ---
 def get_subtask_id(tool_context) -> str:
     """Retrieves the subtask ID stored in the session state."""
@@ -88,7 +109,7 @@ def get_task_context(tool_context) -> str:
     if not task:
         return '{"error": "No Task found in session state"}'
     try:
-        return task.model_dump_json()
+        return _get_task_context_json(task)
     except Exception as e:
         logger.error(f"Error retrieving task context: {e}", exc_info=True)
         return f'{{"error": "Failed to retrieve task context: {str(e)}"}}'
@@ -305,6 +326,43 @@ def create_tracked_executor_tools(task_id: str, session_id: str):
         tracked_log_subtask_id_before_handoff
     ]
 
+# The tool lists are static, so their CachedFunctionTool wrappers are built only once
+@functools.lru_cache(maxsize=1)
+def get_executor_tools() -> tuple:
+    """
+    Returns the executor agent tools wrapped as Google ADK CachedFunctionTool instances.
+    """
+    # Create proper Google ADK tool instances for task management tools
+    task_management_tools = [
+        CachedFunctionTool(get_task_context),
+        CachedFunctionTool(get_subtask_id),
+        CachedFunctionTool(get_subtask_details),
+        CachedFunctionTool(mark_subtask_as_in_progress),
+        CachedFunctionTool(mark_subtask_as_successful),
+        CachedFunctionTool(mark_subtask_as_failed)
+    ]
+    
+    # Plain functions are wrapped; SDK tool objects (like edit_file_tool) are not
+    # compatible with Google ADK and are skipped
+    return (
+        *task_management_tools,
+        *_wrap_function_tools(filesystem_tools_list, "filesystem"),
+        *_wrap_function_tools(cognitive_tools_list, "cognitive"),
+        *_wrap_function_tools(web_tools_list, "web"),
+    )
+
+def _wrap_function_tools(tools: list, kind: str) -> list:
+    """
+    Wraps the plain functions of a tool list as CachedFunctionTool instances.
+    """
+    wrapped = []
+    for tool in tools:
+        if callable(tool) and hasattr(tool, '__name__'):
+            wrapped.append(CachedFunctionTool(tool))
+        else:
+            logger.warning(f"Skipping {kind} tool {getattr(tool, 'name', type(tool))} - not compatible with Google ADK")
+    return wrapped
+
 # Create the executor agent
 def create_executor_agent() -> Agent:
     """
@@ -397,51 +455,8 @@ def create_executor_agent() -> Agent:
     *   When working with artifacts, use descriptive filenames and appropriate MIME types.
     """
     
-    # Import FunctionTool from Google ADK
-    from google.adk.tools import FunctionTool
-    
-    # Create proper Google ADK FunctionTool instances for task management tools
-    task_management_tools = [
-        FunctionTool(func=get_task_context),
-        FunctionTool(func=get_subtask_id),
-        FunctionTool(func=get_subtask_details),
-        FunctionTool(func=mark_subtask_as_in_progress),
-        FunctionTool(func=mark_subtask_as_successful),
-        FunctionTool(func=mark_subtask_as_failed)
-    ]
-    
-    # Convert filesystem tools to proper FunctionTool instances
-    filesystem_tools_converted = []
-    for tool in filesystem_tools_list:
-        if hasattr(tool, '__call__') and hasattr(tool, '__name__'):
-            # It's a function, wrap it with FunctionTool
-            filesystem_tools_converted.append(FunctionTool(func=tool))
-        elif hasattr(tool, 'name') and hasattr(tool, 'on_invoke_tool'):
-            # It's already a tool-like object (like edit_file_tool), keep as is
-            # but we need to convert it to a proper FunctionTool
-            # For now, skip these problematic tools
-            logger.warning(f"Skipping tool {getattr(tool, 'name', 'unknown')} - not compatible with Google ADK")
-        else:
-            logger.warning(f"Unknown tool type: {type(tool)}")
-    
-    # Convert cognitive tools to proper FunctionTool instances
-    cognitive_tools_converted = []
-    for tool in cognitive_tools_list:
-        if hasattr(tool, '__call__') and hasattr(tool, '__name__'):
-            cognitive_tools_converted.append(FunctionTool(func=tool))
-        else:
-            logger.warning(f"Unknown cognitive tool type: {type(tool)}")
-    
-    # Convert web tools to proper FunctionTool instances
-    web_tools_converted = []
-    for tool in web_tools_list:
-        if hasattr(tool, '__call__') and hasattr(tool, '__name__'):
-            web_tools_converted.append(FunctionTool(func=tool))
-        else:
-            logger.warning(f"Unknown web tool type: {type(tool)}")
-    
     # Combine all tools
-    all_tools = task_management_tools + filesystem_tools_converted + cognitive_tools_converted + web_tools_converted
+    all_tools = list(get_executor_tools())
     
     # Create InMemoryArtifactService for handling binary data
     artifact_service = InMemoryArtifactService()
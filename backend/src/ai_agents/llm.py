@@ -0,0 +1,12 @@
+import functools
+
+from google.adk.models.lite_llm import LiteLlm
+
+
+@functools.lru_cache(maxsize=8)
+def get_llm(model: str) -> LiteLlm:
+    """
+    Returns the shared LiteLlm wrapper for a model. The model comes from settings and
+    the wrapper holds no per-request state, so every agent reuses one instance.
+    """
+    return LiteLlm(model=model)
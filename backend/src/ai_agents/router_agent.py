@@ -1,12 +1,13 @@
 import logging
-from typing import AsyncGenerator, List, Any, Optional, Dict
+from typing import AsyncGenerator, List, Any, Optional, Dict, Tuple
 import json 
 from enum import Enum
 from datetime import datetime, timezone
 
 from src.model.task import Task
 from src.ai_agents.utils import detect_language, get_language_instruction
-from src.ai_agents.chat_agent import stream_chat_with_agent_sdk
+from src.ai_agents.chat_agent import stream_chat_with_agent_sdk, create_workspace_for_task
+from src.ai_agents.llm import get_llm
 from src.ai_agents.autonomous_data_agent import stream_data_analysis_response
 from src.ai_agents.agent_tracker import get_tracker, AgentTracker
 from src.core.config import settings
@@ -16,7 +17,6 @@ from google.adk.agents import Agent  # type: ignore
 from google.adk.sessions import InMemorySessionService  # type: ignore
 from google.adk.runners import Runner  # type: ignore
 from google.genai import types  # type: ignore
-from google.adk.models.lite_llm import LiteLlm
 from google.adk.tools import FunctionTool  # type: ignore
 
 logger = logging.getLogger(__name__)
@@ -29,6 +29,28 @@ class AgentType(Enum):
     PLANNING = "planning"
     EXECUTOR = "executor"
 
+# Display name, transfer reason (formatted with the confidence), icon and message prefix
+# for each route; built once instead of per request in every routing branch
+AGENT_ROUTES: Dict[AgentType, Tuple[str, str, str, str]] = {
+    AgentType.DATA_ANALYSIS: (
+        "Data Analysis Agent", "Data analysis request detected with confidence {confidence:.2f}", "🔍", ""),
+    AgentType.CODE_DEVELOPMENT: (
+        "Code Development Agent", "Code development request detected with confidence {confidence:.2f}", "💻", "[CODE DEVELOPMENT FOCUS] "),
+    AgentType.RESEARCH: (
+        "Research Agent", "Research request detected with confidence {confidence:.2f}", "🔬", "[RESEARCH FOCUS] "),
+    AgentType.PLANNING: (
+        "Planning Agent", "Planning request detected with confidence {confidence:.2f}", "📋", "[PLANNING FOCUS] "),
+    AgentType.GENERAL_CHAT: (
+        "General Chat Agent", "General chat or fallback (confidence: {confidence:.2f})", "💬", ""),
+}
+
+ROUTING_MESSAGE_TEMPLATE = (
+    "🔗 **Agent Routing:**\n"
+    "  • Router → **{agent_name}** (confidence: {confidence:.2f})\n"
+    "    Reason: {reason}\n\n"
+    "{icon} Routing to **{agent_name}**...\n\n"
+)
+
 def analyze_request_intent(user_message: str) -> Dict[str, Any]:
     """
     Analyzes user request to determine the best agent and approach.
@@ -159,7 +181,7 @@ Be intelligent, helpful, and efficient in your routing decisions."""
 
     agent = Agent(
         name="intelligent_router_agent",
-        model=LiteLlm(model=f"openai/{settings.OPENAI_MODEL}"),
+        model=get_llm(f"openai/{settings.OPENAI_MODEL}"),
         instruction=instruction,
         tools=tools
     )
@@ -172,7 +194,6 @@ async def route_and_execute_request(task: Task, user_message: str, workspace_pat
     Provides real-time execution trace and tool call monitoring.
     """
     # Get or create the tracker for this task/session
-    from src.ai_agents.agent_tracker import get_tracker
     effective_session_id = session_id or f"session_{task.id}"
     tracker = get_tracker(str(task.id), effective_session_id)
     
@@ -195,7 +216,7 @@ async def route_and_execute_request(task: Task, user_message: str, workspace_pat
             }
         )
         
-        logger.info(f"Request analysis: agent_type={agent_type}, confidence={confidence}")
+        logger.info("Request analysis: agent_type=%s, confidence=%s", agent_type, confidence)
         
         # Yield detailed routing information
         yield f"🔍 **Agent Routing Analysis**\n"
@@ -209,93 +230,24 @@ async def route_and_execute_request(task: Task, user_message: str, workspace_pat
         yield f"📋 Task: {str(task.id)}\n"
         yield f"🔗 Session: {session_id or f'session_{task.id}'}\n\n"
         
-        # Route to appropriate agent based on analysis
+        # Route to appropriate agent based on analysis (EXECUTOR has no dedicated route yet)
+        agent_name, reason_template, icon, message_prefix = AGENT_ROUTES.get(agent_type, AGENT_ROUTES[AgentType.GENERAL_CHAT])
+        reason = reason_template.format(confidence=confidence)
+        tracker.log_agent_transfer(
+            from_agent="Router",
+            to_agent=agent_name,
+            reason=reason,
+            confidence_score=confidence
+        )
+        
+        # Stream the agent transfer immediately
+        yield ROUTING_MESSAGE_TEMPLATE.format(agent_name=agent_name, confidence=confidence, reason=reason, icon=icon)
         if agent_type == AgentType.DATA_ANALYSIS:
-            tracker.log_agent_transfer(
-                from_agent="Router",
-                to_agent="Data Analysis Agent",
-                reason=f"Data analysis request detected with confidence {confidence:.2f}",
-                confidence_score=confidence
-            )
-            
-            # Stream the agent transfer immediately
-            yield f"🔗 **Agent Routing:**\n"
-            yield f"  • Router → **Data Analysis Agent** (confidence: {confidence:.2f})\n"
-            yield f"    Reason: Data analysis request detected with confidence {confidence:.2f}\n\n"
-            
-            yield f"🔍 Routing to **Data Analysis Agent**...\n\n"
             async for chunk in stream_data_analysis_response(task, user_message, workspace_path, session_id):
                 yield chunk
-                
-        elif agent_type == AgentType.CODE_DEVELOPMENT:
-            tracker.log_agent_transfer(
-                from_agent="Router",
-                to_agent="Code Development Agent",
-                reason=f"Code development request detected with confidence {confidence:.2f}",
-                confidence_score=confidence
-            )
-            
-            # Stream the agent transfer immediately
-            yield f"🔗 **Agent Routing:**\n"
-            yield f"  • Router → **Code Development Agent** (confidence: {confidence:.2f})\n"
-            yield f"    Reason: Code development request detected with confidence {confidence:.2f}\n\n"
-            
-            yield f"💻 Routing to **Code Development Agent**...\n\n"
-            # For now, route to general chat agent with coding focus
-            async for chunk in stream_chat_with_agent_sdk(task, f"[CODE DEVELOPMENT FOCUS] {user_message}", session_id=session_id):
-                yield chunk
-                
-        elif agent_type == AgentType.RESEARCH:
-            tracker.log_agent_transfer(
-                from_agent="Router",
-                to_agent="Research Agent",
-                reason=f"Research request detected with confidence {confidence:.2f}",
-                confidence_score=confidence
-            )
-            
-            # Stream the agent transfer immediately
-            yield f"🔗 **Agent Routing:**\n"
-            yield f"  • Router → **Research Agent** (confidence: {confidence:.2f})\n"
-            yield f"    Reason: Research request detected with confidence {confidence:.2f}\n\n"
-            
-            yield f"🔬 Routing to **Research Agent**...\n\n"
-            # For now, route to general chat agent with research focus
-            async for chunk in stream_chat_with_agent_sdk(task, f"[RESEARCH FOCUS] {user_message}", session_id=session_id):
-                yield chunk
-                
-        elif agent_type == AgentType.PLANNING:
-            tracker.log_agent_transfer(
-                from_agent="Router",
-                to_agent="Planning Agent",
-                reason=f"Planning request detected with confidence {confidence:.2f}",
-                confidence_score=confidence
-            )
-            
-            # Stream the agent transfer immediately
-            yield f"🔗 **Agent Routing:**\n"
-            yield f"  • Router → **Planning Agent** (confidence: {confidence:.2f})\n"
-            yield f"    Reason: Planning request detected with confidence {confidence:.2f}\n\n"
-            
-            yield f"📋 Routing to **Planning Agent**...\n\n"
-            # For now, route to general chat agent with planning focus
-            async for chunk in stream_chat_with_agent_sdk(task, f"[PLANNING FOCUS] {user_message}", session_id=session_id):
-                yield chunk
-                
-        else:  # AgentType.GENERAL_CHAT or fallback
-            tracker.log_agent_transfer(
-                from_agent="Router",
-                to_agent="General Chat Agent",
-                reason=f"General chat or fallback (confidence: {confidence:.2f})",
-                confidence_score=confidence
-            )
-            
-            # Stream the agent transfer immediately
-            yield f"🔗 **Agent Routing:**\n"
-            yield f"  • Router → **General Chat Agent** (confidence: {confidence:.2f})\n"
-            yield f"    Reason: General chat or fallback (confidence: {confidence:.2f})\n\n"
-            
-            yield f"💬 Routing to **General Chat Agent**...\n\n"
-            async for chunk in stream_chat_with_agent_sdk(task, user_message, session_id=session_id):
+        else:
+            # Specialised requests go to the general chat agent with a focus prefix for now
+            async for chunk in stream_chat_with_agent_sdk(task, f"{message_prefix}{user_message}", session_id=session_id):
                 yield chunk
         
         # Log completion
@@ -349,11 +301,8 @@ async def stream_intelligent_router_response(task: Task, user_message: str, sess
     Creates workspace and routes to appropriate specialist agent.
     """
     try:
-        # Import workspace creation from chat_agent
-        from src.ai_agents.chat_agent import create_workspace_for_task
-        
         # Create workspace for this task
-        workspace_path = create_workspace_for_task(str(task.id))
+        workspace_path = await create_workspace_for_task(str(task.id))
         
         # Route and execute the request
         async for chunk in route_and_execute_request(task, user_message, workspace_path, session_id):
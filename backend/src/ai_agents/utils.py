@@ -1,8 +1,22 @@
 import re
 import logging
+import functools
 
 logger = logging.getLogger(__name__)
 
+# Common non-English language patterns, compiled once
+_LANGUAGE_PATTERNS = {
+    'es': re.compile(r'\b(el|la|los|las|un|una|y|o|que|en|con|por|para|como|está|ser|tener)\b', re.IGNORECASE),
+    'fr': re.compile(r'\b(le|la|les|un|une|des|et|ou|qui|que|dans|sur|pour|par|avec|est|être|avoir)\b', re.IGNORECASE),
+    'de': re.compile(r'\b(der|die|das|ein|eine|und|oder|ist|sein|haben|für|mit|auf|in|bei|von)\b', re.IGNORECASE),
+    'ru': re.compile(r'[а-яА-Я]', re.IGNORECASE),
+    'zh': re.compile(r'[\u4e00-\u9fff]', re.IGNORECASE),
+    'ja': re.compile(r'[\u3040-\u309f\u30a0-\u30ff]', re.IGNORECASE),
+}
+
+# Both helpers are pure and called with the same task text by every agent on every
+# request, so results are memoized by their input
+@functools.lru_cache(maxsize=1024)
 def detect_language(text: str) -> str:
     """
     Simple heuristic to detect language from text.
@@ -20,25 +34,16 @@ def detect_language(text: str) -> str:
     if not text:
         return 'en'
     
-    # Common non-English language patterns
-    patterns = {
-        'es': r'\b(el|la|los|las|un|una|y|o|que|en|con|por|para|como|está|ser|tener)\b',
-        'fr': r'\b(le|la|les|un|une|des|et|ou|qui|que|dans|sur|pour|par|avec|est|être|avoir)\b',
-        'de': r'\b(der|die|das|ein|eine|und|oder|ist|sein|haben|für|mit|auf|in|bei|von)\b',
-        'ru': r'[а-яА-Я]',
-        'zh': r'[\u4e00-\u9fff]',
-        'ja': r'[\u3040-\u309f\u30a0-\u30ff]',
-    }
-    
     # Check for language patterns
-    for lang, pattern in patterns.items():
-        if re.search(pattern, text, re.IGNORECASE):
+    for lang, pattern in _LANGUAGE_PATTERNS.items():
+        if pattern.search(text):
             # logger.debug(f"Detected language: {lang}")
             return lang
     
     # Default to English
     return 'en'
 
+@functools.lru_cache(maxsize=64)
 def get_language_instruction(language: str) -> str:
     """
     Generate language-specific instructions for agents based on detected language.
@@ -166,13 +166,17 @@ class PersistentWorkspaceManager:
         workspace_path = Path(self.get_workspace_path(task_id))
         session_history_path = workspace_path / "session_history.txt"
         
-        # Append session to history
+        # Append session to history in a single write, so turns saved concurrently
+        # from worker threads do not interleave
         timestamp = datetime.now().isoformat()
+        entry = (
+            f"\n=== Session {timestamp} ===\n"
+            f"Session ID: {session_id}\n"
+            f"User: {user_message}\n"
+            f"Agent: {agent_response}\n"
+        )
         with open(session_history_path, 'a', encoding='utf-8') as f:
-            f.write(f"\n=== Session {timestamp} ===\n")
-            f.write(f"Session ID: {session_id}\n")
-            f.write(f"User: {user_message}\n")
-            f.write(f"Agent: {agent_response}\n")
+            f.write(entry)
         
         logger.info(f"Saved session to workspace for task {task_id}")
     
@@ -217,36 +221,39 @@ class PersistentWorkspaceManager:
         context = self.load_context(task_id)
         workspace_path = self.get_workspace_path(task_id)
         
-        summary = f"# Workspace Context for Task {task_id}\n\n"
-        summary += f"**Workspace Path**: {workspace_path}\n\n"
+        lines = [
+            f"# Workspace Context for Task {task_id}\n\n",
+            f"**Workspace Path**: {workspace_path}\n\n",
+        ]
         
         # Current status
         if 'current_status' in context:
             status = context['current_status']
-            summary += f"**Current Focus**: {status.get('current_focus', 'Not set')}\n"
-            summary += f"**Last Updated**: {status.get('last_updated', 'Unknown')}\n"
+            lines.append(f"**Current Focus**: {status.get('current_focus', 'Not set')}\n")
+            lines.append(f"**Last Updated**: {status.get('last_updated', 'Unknown')}\n")
             
             if status.get('completed_tasks'):
-                summary += f"**Completed Tasks**: {', '.join(status['completed_tasks'])}\n"
+                lines.append(f"**Completed Tasks**: {', '.join(status['completed_tasks'])}\n")
             
             if status.get('next_actions'):
-                summary += f"**Next Actions**: {', '.join(status['next_actions'])}\n"
+                lines.append(f"**Next Actions**: {', '.join(status['next_actions'])}\n")
         
         # Generated files
         if context.get('generated_files'):
-            summary += f"**Generated Files**: {len(context['generated_files'])} files\n"
+            lines.append(f"**Generated Files**: {len(context['generated_files'])} files\n")
             for file in context['generated_files'][:5]:  # Show first 5
-                summary += f"  - {file}\n"
+                lines.append(f"  - {file}\n")
             if len(context['generated_files']) > 5:
-                summary += f"  - ... and {len(context['generated_files']) - 5} more\n"
+                lines.append(f"  - ... and {len(context['generated_files']) - 5} more\n")
         
         # Session history summary
         if 'session_history' in context:
-            lines = context['session_history'].split('\n')
-            session_count = len([line for line in lines if line.startswith('=== Session')])
-            summary += f"**Previous Sessions**: {session_count} sessions\n"
+            session_count = sum(
+                1 for line in context['session_history'].split('\n') if line.startswith('=== Session')
+            )
+            lines.append(f"**Previous Sessions**: {session_count} sessions\n")
         
-        return summary
+        return "".join(lines)
     
     def cleanup_old_workspaces(self, keep_days: int = 30):
         """Clean up workspaces older than specified days (future enhancement)"""
@@ -25,8 +25,8 @@ from src.api.utils import api_error_handler, deserialize_task
 # Constants
 from src.constants import OP_CHAT
 
-# Import the chat agent and tracker
-from src.ai_agents import stream_chat_response
+# Import the tracker; the chat agent is imported inside the streaming endpoint, as it
+# takes seconds to load (Google ADK, LiteLLM)
 from src.ai_agents.agent_tracker import get_tracker, _trackers
 
 logger = logging.getLogger(__name__)
@@ -104,6 +104,8 @@ async def stream_chat_with_task_assistant(
     async def event_generator() -> AsyncGenerator[str, None]:
         """Generate streaming chat events."""
         try:
+            from src.ai_agents import stream_chat_response
+            
             # Use the actual streaming chat response
             async for chunk in stream_chat_response(
                 task=task,
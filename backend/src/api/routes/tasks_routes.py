@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse, JSONResponse
 from typing import List, Optional, cast, AsyncGenerator, Dict, Any
 import logging
-import json
+import orjson
 import asyncio
 from datetime import datetime
 from pydantic import BaseModel
@@ -64,8 +64,8 @@ from src.constants import (
     OP_CHAT,
 )
 
-# Import the chat agent
-from src.ai_agents import stream_chat_response
+# The chat agent is imported inside the chat endpoints: it pulls in Google ADK and LiteLLM,
+# which take seconds to load, and main.py warms it up in a worker thread after startup
 from src.ai_agents.agent_tracker import get_tracker, _trackers
 
 logger = logging.getLogger(__name__)
@@ -815,13 +815,27 @@ async def chat_with_task_assistant(
     if not task:
         raise TaskNotFoundException(f"Task {task_id} not found")
     
+    from src.ai_agents import stream_chat_response
+    
     # Collect the full response
-    full_response = ""
-    async for chunk in stream_chat_response(task, chat_request.message, chat_request.message_history):
-        full_response += chunk
+    full_response = "".join([
+        chunk async for chunk in stream_chat_response(task, chat_request.message, chat_request.message_history)
+    ])
     
     return ChatResponse(response=full_response, task_id=task_id)
 
+# SSE frames for the chat stream have a fixed shape, so only the string value is JSON-encoded
+# per frame instead of a whole dict. orjson escapes it and keeps non-ASCII text as UTF-8,
+# which is several times shorter than json.dumps' \uXXXX escapes for Cyrillic replies.
+# Frames are built as bytes, so the response does not encode every chunk once more
+SSE_CHUNK_PREFIX = b'data: {"chunk": '
+SSE_ERROR_PREFIX = b'data: {"error": '
+SSE_FRAME_END = b'}\n\n'
+SSE_DONE_EVENT = b'data: ' + orjson.dumps({'done': True}) + b'\n\n'
+
+def _sse_frame(prefix: bytes, value: str) -> bytes:
+    return prefix + orjson.dumps(value) + SSE_FRAME_END
+
 @router.post("/{task_id}/chat/stream")
 @api_error_handler(OP_CHAT)
 async def stream_chat_with_task_assistant(
@@ -832,7 +846,7 @@ async def stream_chat_with_task_assistant(
     """
     Chat with an AI assistant about the task (streaming version)
     """
-    async def event_generator():
+    async def event_generator() -> AsyncGenerator[bytes, None]:
         """Generate events for server-sent events (SSE)"""
         try:
             # Get the task data
@@ -840,6 +854,8 @@ async def stream_chat_with_task_assistant(
             if not task:
                 raise TaskNotFoundException(f"Task {task_id} not found")
             
+            from src.ai_agents import stream_chat_response
+            
             # Pass the session_id from the request to stream_chat_response
             session_id = chat_request.session_id
             logger.info(f"Using session_id: {session_id} for chat with task {task_id}")
@@ -854,20 +870,20 @@ async def stream_chat_with_task_assistant(
                     # Ensure chunk is a string before JSON serialization
                     chunk_str = str(chunk)
                     # Format as SSE
-                    yield f"data: {json.dumps({'chunk': chunk_str})}\n\n"
+                    yield _sse_frame(SSE_CHUNK_PREFIX, chunk_str)
             
             # Send completion event
-            yield f"data: {json.dumps({'done': True})}\n\n"
+            yield SSE_DONE_EVENT
         
         except TaskNotFoundException as e:
             logger.error(f"Task not found: {str(e)}")
-            yield f"data: {json.dumps({'error': f'Task not found: {task_id}'})}\n\n"
+            yield _sse_frame(SSE_ERROR_PREFIX, f"Task not found: {task_id}")
         except DeserializationException as e:
             logger.error(f"Error deserializing task: {str(e)}")
-            yield f"data: {json.dumps({'error': f'Error loading task data: {str(e)}'})}\n\n"
+            yield _sse_frame(SSE_ERROR_PREFIX, f"Error loading task data: {str(e)}")
         except Exception as e:
             logger.error(f"Error in streaming chat: {str(e)}")
-            yield f"data: {json.dumps({'error': f'Error: {str(e)}'})}\n\n"
+            yield _sse_frame(SSE_ERROR_PREFIX, f"Error: {str(e)}")
     
     return StreamingResponse(
         event_generator(),
@@ -889,17 +905,18 @@ async def reset_chat_session(
     """
     try:
         # Import the session service from chat_agent
-        from src.ai_agents.chat_agent import _session_service
+        from src.ai_agents.chat_agent import _session_service, forget_session
         from src.core.config import settings
         
         # Generate the session ID that would be used for this task
         session_id = f"session_{task_id}"
         user_id = task_id
+        forget_session(user_id, session_id)
         
         # Try to delete the existing session properly
         try:
             # First check if session exists
-            existing_session = _session_service.get_session(
+            existing_session = await _session_service.get_session(
                 app_name=settings.PROJECT_NAME,
                 user_id=user_id,
                 session_id=session_id
@@ -907,8 +924,7 @@ async def reset_chat_session(
             
             # If session exists, delete it properly
             if existing_session:
-                # Session service methods are synchronous, not async
-                _session_service.delete_session(
+                await _session_service.delete_session(
                     app_name=settings.PROJECT_NAME,
                     user_id=user_id,
                     session_id=session_id
@@ -919,9 +935,9 @@ async def reset_chat_session(
             # Session doesn't exist or error getting it, which is fine for reset
             logger.info(f"Session {session_id} doesn't exist or error getting it: {e}")
         
-        # Create a fresh session using synchronous method
+        # Create a fresh session
         try:
-            new_session = _session_service.create_session(
+            new_session = await _session_service.create_session(
                 app_name=settings.PROJECT_NAME,
                 user_id=user_id,
                 session_id=session_id,
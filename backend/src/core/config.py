@@ -18,6 +18,13 @@ class Settings(BaseSettings):
     # File storage settings
     PROJECTS_BASE_DIR: Path = PROJECT_ROOT / ".data"
 
+    # Internal caches (e.g. parsed data files); kept outside ALLOWED_BASE_DIR so the
+    # agents' file tools never see them
+    CACHE_DIR: Path = PROJECT_ROOT / ".cache"
+
+    # Agent trace logs; outside ALLOWED_BASE_DIR so agents cannot read other sessions' traces
+    LOGS_DIR: Path = PROJECT_ROOT / ".logs"
+
     # OpenAI settings (for use with Google ADK via LiteLLM)
     OPENAI_API_KEY: str = "no key"
     OPENAI_MODEL: str = "gpt-4o-mini"
@@ -4,6 +4,7 @@ import os
 from pathlib import Path
 import nest_asyncio  # type: ignore
 from contextlib import asynccontextmanager
+import importlib
 
 # Apply nest_asyncio to allow nested event loops
 # nest_asyncio.apply()
@@ -32,7 +33,9 @@ from src.api.routes.user_queries_routes import router as user_queries_router
 from src.api.routes.tasks_routes import router as tasks_router
 from src.api.routes.task_context_routes import router as task_context_router
 from src.api.routes.util_routes import router as util_router
+from src.ai_agents.agent_tracker import sweep_stale_trackers
 
+import asyncio
 import logging
 import uvicorn
 
@@ -64,12 +67,26 @@ logging.getLogger("uvicorn.access").setLevel(logging.INFO)
 uvicorn_logger = logging.getLogger("uvicorn")
 uvicorn_logger.setLevel(logging.INFO)
 
+async def warm_up_chat_agent():
+    """Import the chat agent (Google ADK, LiteLLM, agent tools) off the event loop."""
+    try:
+        await asyncio.to_thread(importlib.import_module, "src.ai_agents.chat_agent")
+        logger.info("💬 Chat agent loaded")
+    except Exception as e:
+        logger.error(f"Failed to load chat agent: {e}", exc_info=True)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup logic
+    tracker_sweep_task = asyncio.create_task(sweep_stale_trackers())
+    # The chat routes import the chat agent on first use; loading it here in the background
+    # keeps that multi-second import out of both server startup and the first chat request
+    chat_agent_warmup_task = asyncio.create_task(warm_up_chat_agent())
     logger.info("🚀 FastAPI application started successfully")
     yield
     # Shutdown logic (if needed)
+    tracker_sweep_task.cancel()
+    chat_agent_warmup_task.cancel()
     logger.info("📊 FastAPI application shutdown completed")
 
 app = FastAPI(lifespan=lifespan)
@@ -0,0 +1,196 @@
+# backend/tests/test_agent_tracker.py
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+import pytest
+from src.ai_agents import agent_tracker
+from src.ai_agents.agent_tracker import (
+    AgentTracker, get_tracker, remove_tracker, evict_stale_trackers, flush_trace_logs, prune_trace_logs,
+)
+
+
+@pytest.fixture(autouse=True)
+def trace_log_dir(tmp_path, monkeypatch):
+    """Write trace logs to a temporary directory and start with an empty registry."""
+    monkeypatch.setattr(agent_tracker, "TRACE_LOG_DIR", tmp_path)
+    monkeypatch.setattr(agent_tracker, "_trackers", OrderedDict())
+    return tmp_path
+
+
+class TestAgentTracker:
+
+    def test_summary_counts_all_events(self, monkeypatch):
+        """Summary counters keep counting after the in-memory history is trimmed."""
+        monkeypatch.setattr(agent_tracker, "MAX_TRACKED_EVENTS", 3)
+        tracker = AgentTracker("task-1", "session-1")
+
+        for i in range(5):
+            tracker.log_tool_call("read_file", {"path": f"f{i}"}, success=i != 0)
+        tracker.log_activity("Router", "START", "started")
+        tracker.log_agent_transfer("Router", "Data Agent", "csv request")
+
+        summary = tracker.get_summary()
+        assert len(tracker.tool_calls) == 3
+        assert summary["total_tool_calls"] == 5
+        assert summary["success_rate"]["tool_calls"] == pytest.approx(0.8)
+        assert summary["total_activities"] == 1
+        assert summary["total_transfers"] == 1
+        assert set(summary["agents_used"]) == {"Router", "Data Agent"}
+        assert summary["tools_used"] == ["read_file"]
+        assert "read_file: 5 calls (4/5 successful)" in tracker.format_trace()
+
+    def test_events_are_streamed_to_log_file(self, trace_log_dir):
+        """Each logged event is appended as one JSON line by the shared writer."""
+        tracker = get_tracker("task-1", "session/1")
+        tracker.log_activity("Router", "START", "started")
+        tracker.log_tool_call("web_search", {"query": "elephant"}, result="ok")
+        remove_tracker("task-1", "session/1")
+        flush_trace_logs()
+
+        log_path = trace_log_dir / "task-1_session_1.jsonl"
+        lines = [json.loads(line) for line in log_path.read_text().splitlines()]
+        assert [line["type"] for line in lines] == ["activity", "tool_call"]
+        assert lines[1]["tool_name"] == "web_search"
+
+    def test_events_reach_disk_while_tracker_is_live(self, trace_log_dir):
+        """Lines are written as they are logged, not when the tracker is closed or evicted."""
+        tracker = get_tracker("task-1", "session-1")
+        tracker.log_activity("Router", "START", "started")
+        flush_trace_logs()
+
+        assert tracker.log_path.read_bytes().count(b"\n") == 1
+        assert "task-1_session-1" in agent_tracker._trackers
+
+    def test_timestamps_are_formatted_on_export(self):
+        """Events store integer timestamps and expose ISO strings only when read."""
+        tracker = AgentTracker("task-1", "session-1")
+        before = datetime.now(timezone.utc)
+        tracker.log_activity("Router", "START", "started")
+        tracker.log_activity("Router", "DONE", "finished")
+
+        first, second = tracker.activities
+        assert isinstance(first.timestamp_ns, int)
+        assert first.timestamp_ns <= second.timestamp_ns
+        assert datetime.fromisoformat(first.timestamp) >= before.replace(microsecond=0)
+        exported = json.loads(tracker.to_json())
+        assert exported["summary"]["total_activities"] == 2
+
+    def test_export_keeps_iso_timestamps(self):
+        """Exported events carry the ISO timestamp string, not the internal nanoseconds."""
+        tracker = AgentTracker("task-1", "session-1")
+        tracker.log_activity("Router", "START", "started")
+        tracker.log_tool_call("search", {"q": "x"}, result="ok")
+        tracker.log_agent_transfer("Router", "Data", "csv question")
+
+        exported = json.loads(tracker.to_json())
+
+        for section, events in (("activities", tracker.activities), ("tool_calls", tracker.tool_calls),
+                                ("agent_transfers", tracker.agent_transfers)):
+            (entry,) = exported[section]
+            assert entry["timestamp"] == events[0].timestamp
+            assert "timestamp_ns" not in entry
+            assert datetime.fromisoformat(entry["timestamp"]).tzinfo == timezone.utc
+        assert exported["tool_calls"][0]["parameters"] == {"q": "x"}
+
+    def test_evict_stale_trackers(self):
+        """Trackers idle for longer than the TTL are dropped from the registry."""
+        get_tracker("task-1", "old")
+        fresh = get_tracker("task-1", "new")
+        agent_tracker._trackers["task-1_old"].last_activity_time -= 10
+
+        assert evict_stale_trackers(ttl_seconds=5) == 1
+        assert get_tracker("task-1", "new") is fresh
+        assert "task-1_old" not in agent_tracker._trackers
+
+    def test_sweep_while_worker_threads_create_trackers(self, monkeypatch):
+        """Evicting on the event loop is safe while worker threads call get_tracker."""
+        monkeypatch.setattr(agent_tracker, "MAX_TRACKERS", 500)
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        stop = threading.Event()
+
+        def create():
+            i = 0
+            while not stop.is_set():
+                get_tracker("task-1", f"s{i % 1000}")
+                i += 1
+
+        workers = [threading.Thread(target=create) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        try:
+            for _ in range(500):
+                evict_stale_trackers()
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join()
+            sys.setswitchinterval(switch_interval)
+
+        assert len(agent_tracker._trackers) <= 500
+
+    def test_registry_evicts_least_recently_used(self, monkeypatch):
+        """The registry never grows past MAX_TRACKERS and closes what it evicts."""
+        monkeypatch.setattr(agent_tracker, "MAX_TRACKERS", 2)
+        first = get_tracker("task-1", "a")
+        first.log_activity("Router", "START", "started")
+        get_tracker("task-1", "b")
+        get_tracker("task-1", "a")  # touch "a" so "b" becomes the oldest
+        get_tracker("task-1", "c")
+
+        assert list(agent_tracker._trackers) == ["task-1_a", "task-1_c"]
+        flush_trace_logs()
+        assert first.log_path.exists()
+
+    @pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc to list open files")
+    def test_full_registry_holds_no_open_log_files(self, trace_log_dir, monkeypatch):
+        """Live and evicted trackers leave no trace file descriptors open."""
+        monkeypatch.setattr(agent_tracker, "MAX_TRACKERS", 20)
+        for i in range(50):
+            get_tracker("task-1", f"session-{i}").log_activity("Router", "START", "started")
+        flush_trace_logs()
+
+        open_files = [os.path.realpath(f"/proc/self/fd/{fd}") for fd in os.listdir("/proc/self/fd")]
+        assert len(list(trace_log_dir.glob("*.jsonl"))) == 50
+        assert not [path for path in open_files if path.startswith(str(trace_log_dir))]
+
+
+class TestPruneTraceLogs:
+
+    @pytest.fixture
+    def write_log(self, trace_log_dir):
+        """Create a trace log of the given size, last modified age_seconds ago."""
+        def write(name, size, age_seconds):
+            path = trace_log_dir / f"{name}.jsonl"
+            path.write_bytes(b"x" * size)
+            mtime = time.time() - age_seconds
+            os.utime(path, (mtime, mtime))
+            return path
+        return write
+
+    def test_old_logs_are_removed(self, write_log):
+        """Logs past the retention period are deleted, recent ones are kept."""
+        old = write_log("old", 10, age_seconds=3600)
+        recent = write_log("recent", 10, age_seconds=60)
+
+        assert prune_trace_logs(retention_seconds=600) == 1
+        assert not old.exists() and recent.exists()
+
+    def test_total_size_is_capped_oldest_first(self, write_log):
+        """Beyond the size cap the oldest logs go first until the rest fits."""
+        oldest = write_log("a", 100, age_seconds=30)
+        older = write_log("b", 100, age_seconds=20)
+        newest = write_log("c", 100, age_seconds=10)
+
+        assert prune_trace_logs(max_total_bytes=150) == 2
+        assert not oldest.exists() and not older.exists() and newest.exists()
+
+    def test_missing_directory_is_ignored(self, trace_log_dir, monkeypatch):
+        """A server that has not traced anything yet has nothing to prune."""
+        monkeypatch.setattr(agent_tracker, "TRACE_LOG_DIR", trace_log_dir / "missing")
+
+        assert prune_trace_logs() == 0
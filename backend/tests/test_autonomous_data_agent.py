@@ -0,0 +1,170 @@
+# backend/tests/test_autonomous_data_agent.py
+import os
+import pytest
+from src.ai_agents import autonomous_data_agent
+from src.ai_agents.autonomous_data_agent import (
+    _DFDescriptor, _load_df, analyze_csv_data, create_data_visualizations_batch,
+)
+
+
+@pytest.fixture(autouse=True)
+def csv_cache(tmp_path, monkeypatch):
+    """Keep parquet sidecars in a temporary cache and start with empty parse caches."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(autonomous_data_agent, "CSV_CACHE_DIR", cache_dir)
+    autonomous_data_agent._load_df_cached.cache_clear()
+    autonomous_data_agent._describe_df_cached.cache_clear()
+    yield cache_dir
+    autonomous_data_agent._load_df_cached.cache_clear()
+    autonomous_data_agent._describe_df_cached.cache_clear()
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    """Write CSV text into a data directory and return its path."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+
+    def write(text, name="data.csv"):
+        path = data_dir / name
+        path.write_text(text)
+        return str(path)
+
+    return write
+
+
+class TestLoadDf:
+
+    def test_short_rows_are_padded(self, write_csv):
+        """Files the pyarrow parser rejects are loaded with the default parser."""
+        df = _load_df(write_csv("a,b,c\n1,2,3\n4,5\n"))
+
+        assert df.shape == (2, 3)
+        assert df["c"].isna().tolist() == [False, True]
+
+    def test_sidecar_is_kept_outside_the_data_directory(self, write_csv, csv_cache):
+        """The parquet cache never appears next to the user's files."""
+        path = write_csv("a,b\n1,2\n")
+
+        _load_df(path)
+
+        assert os.listdir(os.path.dirname(path)) == ["data.csv"]
+        assert len(list(csv_cache.glob("*.parquet"))) == 1
+
+    def test_replaced_file_with_older_mtime_is_reloaded(self, write_csv, csv_cache):
+        """A new version of the file is parsed again even if its mtime went backwards."""
+        path = write_csv("a,b\n1,2\n")
+        stat = os.stat(path)
+        assert _load_df(path)["a"].tolist() == [1]
+
+        with open(path, "w") as f:
+            f.write("a,b\n7,8\n9,10\n")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+        autonomous_data_agent._load_df_cached.cache_clear()
+
+        assert _load_df(path)["a"].tolist() == [7, 9]
+        assert len(list(csv_cache.glob("*.parquet"))) == 1
+
+
+class TestWhitespaceColumns:
+
+    def test_date_column_does_not_break_quality_analysis(self, write_csv):
+        """ISO dates parsed into datetime.date objects are not probed as text."""
+        path = write_csv("day,value,name\n2024-01-01,1, x\n2024-01-02,2,y\n2024-01-03,3,z\n")
+
+        result = analyze_csv_data(path, "quality")
+
+        assert "Error" not in result
+        assert "Column 'name' has leading/trailing whitespace" in result
+        assert "'day'" not in result.split("Potential issues detected:")[1]
+
+    def test_unicode_padding_is_detected(self):
+        """NBSP and ideographic space padding count as whitespace, not only ASCII."""
+        pd, _ = autonomous_data_agent._get_pd_np()
+        df = pd.DataFrame({
+            "nbsp": ["a\u00a0", "b"],
+            "ideo": ["\u3000c", "d"],
+            "tab": ["e\t", "f"],
+            "inner": ["g\u00a0h", "i j"],
+        })
+
+        assert _DFDescriptor(df).whitespace_columns() == ["nbsp", "ideo", "tab"]
+
+    def test_mixed_object_column_falls_back_to_pandas(self):
+        """Columns Arrow cannot represent are checked value by value."""
+        pd, _ = autonomous_data_agent._get_pd_np()
+        df = pd.DataFrame({
+            "mixed": pd.Series([" a", 1, None], dtype=object),
+            "clean": pd.Series(["a", 2, None], dtype=object),
+        })
+
+        assert _DFDescriptor(df).whitespace_columns() == ["mixed"]
+
+
+class TestDescriptorStatistics:
+
+    @pytest.fixture
+    def df(self):
+        pd, np = autonomous_data_agent._get_pd_np()
+        return pd.DataFrame({
+            "with_nulls": [1.5, None, 3.0, 4.25, 10.0],
+            "all_null": pd.Series([np.nan] * 5, dtype="float64"),
+            "single": [None, None, 7.0, None, None],
+            "ints": [3, 1, 2, 2, 5],
+            "name": ["a", "b", None, "a", "c"],
+        })
+
+    def test_describe_matches_pandas(self, df):
+        """Arrow kernels give the same summary as DataFrame.describe, nulls included."""
+        pd, _ = autonomous_data_agent._get_pd_np()
+
+        pd.testing.assert_frame_equal(_DFDescriptor(df).describe(), df.describe())
+
+    def test_nunique_matches_pandas(self, df):
+        """Distinct counts ignore nulls like DataFrame.nunique."""
+        assert _DFDescriptor(df).nunique() == df.nunique().to_dict()
+
+    def test_analysis_follows_file_changes(self, write_csv):
+        """A rewritten file is analyzed again instead of served from the cache."""
+        path = write_csv("x\n1\n2\n")
+        assert "Shape: 2 rows" in analyze_csv_data(path)
+
+        with open(path, "a") as f:
+            f.write("3\n")
+
+        assert "Shape: 3 rows" in analyze_csv_data(path)
+
+
+class TestCreateDataVisualizationsBatch:
+
+    def test_default_paths_include_both_columns(self, write_csv, tmp_path, monkeypatch):
+        """Charts of the same x column against different y columns get their own files."""
+        monkeypatch.chdir(tmp_path)
+        path = write_csv("x,y1,y2\n1,2,3\n2,4,6\n3,6,9\n")
+
+        result = create_data_visualizations_batch(path, [
+            {"chart_type": "scatter", "x_column": "x", "y_column": "y1"},
+            {"chart_type": "scatter", "x_column": "x", "y_column": "y2"},
+            {"chart_type": "histogram", "x_column": "x"},
+        ])
+
+        assert result.splitlines() == [
+            "Chart saved to data_scatter_x_y1.png",
+            "Chart saved to data_scatter_x_y2.png",
+            "Chart saved to data_histogram_x.png",
+        ]
+        assert all((tmp_path / name).stat().st_size > 0 for name in
+                   ("data_scatter_x_y1.png", "data_scatter_x_y2.png", "data_histogram_x.png"))
+
+    def test_duplicate_output_path_is_rendered_once(self, write_csv, tmp_path):
+        """A second chart targeting an already claimed file is reported instead of overwriting it."""
+        path = write_csv("x,y\n1,2\n2,4\n")
+        output = str(tmp_path / "chart.png")
+
+        first, second = create_data_visualizations_batch(path, [
+            {"chart_type": "line", "x_column": "x", "y_column": "y", "output_path": output},
+            {"chart_type": "bar", "x_column": "x", "output_path": output},
+        ]).splitlines()
+
+        assert first == f"Chart saved to {output}"
+        assert second.startswith("Error creating visualization") and "used by another chart" in second
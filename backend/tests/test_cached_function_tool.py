@@ -0,0 +1,35 @@
+# backend/tests/test_cached_function_tool.py
+from unittest.mock import patch
+from google.adk.tools import FunctionTool
+from src.ai_agents.tools.cached_function_tool import CachedFunctionTool, wrap_tools
+
+
+def read_file(path: str) -> str:
+    """Reads a file from the workspace."""
+    return path
+
+
+class TestCachedFunctionTool:
+
+    def test_declaration_is_built_once(self):
+        """Repeated model calls reuse the first declaration."""
+        tool = CachedFunctionTool(read_file)
+
+        with patch.object(FunctionTool, "_get_declaration", autospec=True,
+                          side_effect=FunctionTool._get_declaration) as build:
+            first = tool._get_declaration()
+            second = tool._get_declaration()
+
+        assert second is first
+        assert first.name == "read_file"
+        build.assert_called_once()
+
+    def test_wrap_tools_keeps_tool_objects(self):
+        """Functions are wrapped while existing tool objects are passed through."""
+        existing = FunctionTool(func=read_file)
+
+        wrapped = wrap_tools([read_file, existing])
+
+        assert isinstance(wrapped[0], CachedFunctionTool)
+        assert wrapped[0].func is read_file
+        assert wrapped[1] is existing
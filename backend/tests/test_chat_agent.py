@@ -0,0 +1,506 @@
+# backend/tests/test_chat_agent.py
+import asyncio
+from collections import OrderedDict
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from google.adk.events import Event
+from google.genai import types
+from src.ai_agents import agent_tracker, chat_agent
+from src.ai_agents.chat_agent import (
+    build_user_content,
+    coalesce_stream,
+    create_workspace_for_task,
+    format_chat_error,
+    format_task_details,
+    format_tool_result_preview,
+    get_enhanced_instruction,
+    get_session_instruction,
+    stream_chat_response,
+    forget_session,
+    get_or_create_session,
+    get_chat_runner,
+    stream_chat_with_agent_sdk,
+)
+from src.model.task import Task, TaskState
+
+
+TOOL_FACTORIES = [
+    "create_workspace_aware_tools",
+    "create_intent_understanding_tools",
+    "create_task_execution_tools",
+    "create_tracked_cognitive_tools",
+    "create_tracked_web_tools",
+    "create_tracked_task_management_tools",
+    "create_workspace_management_tools",
+    "create_tracked_database_tools",
+    "create_tracked_executor_tools",
+]
+
+
+@pytest.fixture(autouse=True)
+def chat_runners(monkeypatch):
+    """Start every test with an empty runner cache and tools that do not touch the disk."""
+    for factory in TOOL_FACTORIES:
+        monkeypatch.setattr(chat_agent, factory, lambda task_id, session_id: [])
+    runners = OrderedDict()
+    monkeypatch.setattr(chat_agent, "_chat_runners", runners)
+    monkeypatch.setattr(chat_agent, "_session_cache", OrderedDict())
+    monkeypatch.setattr(chat_agent, "_session_instructions", OrderedDict())
+    return runners
+
+
+@pytest.fixture
+def adk_events(monkeypatch, tmp_path):
+    """Replace the ADK runner, session service and workspace with local fakes.
+
+    Returns the list of events the fake runner will stream; tests fill it in.
+    """
+    events = []
+
+    class FakeRunner:
+        def __init__(self, agent, **kwargs):
+            self.agent = agent
+
+        async def run_async(self, **kwargs):
+            for event in events:
+                yield event
+
+    session_service = MagicMock()
+    session_service.get_session = AsyncMock(return_value=MagicMock(id="session-1"))
+    monkeypatch.setattr(chat_agent, "Runner", FakeRunner)
+    monkeypatch.setattr(chat_agent, "_session_service", session_service)
+    monkeypatch.setattr(chat_agent, "create_workspace_for_task", AsyncMock(return_value=str(tmp_path)))
+    monkeypatch.setattr(chat_agent, "get_enhanced_instruction", lambda task, workspace_path, language: "instruction")
+    monkeypatch.setattr(agent_tracker, "TRACE_LOG_DIR", tmp_path)
+    monkeypatch.setattr(agent_tracker, "_trackers", OrderedDict())
+    return events
+
+
+def model_event(*parts, partial=None):
+    return Event(
+        author="autonomous_task_assistant",
+        content=types.Content(role="model", parts=list(parts)),
+        partial=partial,
+    )
+
+
+class TestChatRunnerCache:
+
+    @pytest.mark.asyncio
+    async def test_runner_is_reused_for_the_same_session(self):
+        """A second turn in the same session reuses the runner and refreshes the agent instruction."""
+        first = await get_chat_runner("task-1", "session-1", "first instruction")
+        second = await get_chat_runner("task-1", "session-1", "second instruction")
+
+        assert second is first
+        assert second.agent.instruction == "second instruction"
+        assert await get_chat_runner("task-1", "session-2", "other") is not first
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_runner_is_evicted(self, monkeypatch, chat_runners):
+        """The cache never holds more than MAX_CHAT_RUNNERS runners."""
+        monkeypatch.setattr(chat_agent, "MAX_CHAT_RUNNERS", 2)
+        await get_chat_runner("task-1", "a", "instruction")
+        await get_chat_runner("task-1", "b", "instruction")
+        await get_chat_runner("task-1", "a", "instruction")
+        await get_chat_runner("task-1", "c", "instruction")
+
+        assert list(chat_runners) == [("task-1", "a"), ("task-1", "c")]
+
+    @pytest.mark.asyncio
+    async def test_idle_runner_expires(self, monkeypatch, chat_runners):
+        """A runner unused for longer than the TTL is rebuilt on the next message."""
+        first = await get_chat_runner("task-1", "a", "instruction")
+        await get_chat_runner("task-1", "b", "instruction")
+        runner, last_used = chat_runners[("task-1", "a")]
+        chat_runners[("task-1", "a")] = (runner, last_used - chat_agent.CHAT_RUNNER_TTL_SECONDS)
+        chat_runners.move_to_end(("task-1", "a"), last=False)
+
+        assert await get_chat_runner("task-1", "a", "instruction") is not first
+        assert list(chat_runners) == [("task-1", "b"), ("task-1", "a")]
+
+
+@pytest.fixture
+def session_service(monkeypatch):
+    """Replace the ADK session service with a mock that has no sessions."""
+    service = MagicMock()
+    service.get_session = AsyncMock(return_value=None)
+    service.create_session = AsyncMock(
+        side_effect=lambda **kwargs: MagicMock(id=kwargs["session_id"], state=kwargs["state"])
+    )
+    monkeypatch.setattr(chat_agent, "_session_service", service)
+    return service
+
+
+class TestGetOrCreateSession:
+
+    @pytest.mark.asyncio
+    async def test_missing_session_is_created_with_state(self, session_service):
+        """A chat without a session gets one holding the initial state."""
+        session = await get_or_create_session("task-1", "session-1", state={"task_id": "task-1"})
+
+        assert session.id == "session-1"
+        assert session_service.create_session.call_args.kwargs["state"] == {"task_id": "task-1"}
+
+    @pytest.mark.asyncio
+    async def test_session_lookup_is_cached(self, session_service):
+        """Later turns within the TTL do not query the session service again."""
+        first = await get_or_create_session("task-1", "session-1", state={})
+        second = await get_or_create_session("task-1", "session-1", state={})
+
+        assert second is first
+        session_service.get_session.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_or_forgotten_session_is_looked_up_again(self, session_service, monkeypatch):
+        """The cache entry is dropped after the TTL and by forget_session."""
+        await get_or_create_session("task-1", "session-1", state={})
+        monkeypatch.setattr(chat_agent, "SESSION_CACHE_TTL_SECONDS", 0.0)
+        await get_or_create_session("task-1", "session-1", state={})
+        monkeypatch.setattr(chat_agent, "SESSION_CACHE_TTL_SECONDS", 60.0)
+        forget_session("task-1", "session-1")
+        await get_or_create_session("task-1", "session-1", state={})
+
+        assert session_service.get_session.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_turns_create_the_session_once(self, session_service):
+        """Turns racing on a new chat share one created session and leave no lock behind."""
+        async def slow_lookup(**kwargs):
+            await asyncio.sleep(0)
+            return None
+
+        session_service.get_session.side_effect = slow_lookup
+
+        sessions = await asyncio.gather(
+            *(get_or_create_session("task-1", "session-1", state={}) for _ in range(3))
+        )
+
+        assert sessions[1] is sessions[0] and sessions[2] is sessions[0]
+        session_service.create_session.assert_awaited_once()
+        assert not chat_agent._session_locks
+
+    @pytest.mark.asyncio
+    async def test_late_turn_waits_for_woken_waiter(self, session_service, monkeypatch):
+        """A turn arriving while a released lock's waiter has not run yet still queues behind it."""
+        monkeypatch.setattr(chat_agent, "SESSION_CACHE_TTL_SECONDS", 0.0)
+        gate = asyncio.Event()
+        active = 0
+        max_active = 0
+
+        async def lookup(**kwargs):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await gate.wait()
+            for _ in range(3):
+                await asyncio.sleep(0)
+            active -= 1
+            return None
+
+        session_service.get_session.side_effect = lookup
+        first = asyncio.create_task(get_or_create_session("task-1", "session-1", state={}))
+        second = asyncio.create_task(get_or_create_session("task-1", "session-1", state={}))
+        await asyncio.sleep(0)
+        gate.set()
+        await first
+        third = asyncio.create_task(get_or_create_session("task-1", "session-1", state={}))
+        await asyncio.gather(second, third)
+
+        assert max_active == 1
+        assert not chat_agent._session_locks
+
+
+class TestStreamChatWithAgentSdk:
+
+    @pytest.mark.asyncio
+    async def test_streams_tool_progress_and_text(self, adk_events):
+        """Tool calls, tool results and the final answer are streamed in order."""
+        adk_events.extend([
+            model_event(types.Part(function_call=types.FunctionCall(name="read_file", args={"path": "a.txt"}))),
+            model_event(types.Part(function_response=types.FunctionResponse(name="read_file", response={"result": "ok"}))),
+            model_event(types.Part(text="Done."), types.Part(text=" Bye.")),
+        ])
+        task = Task.create_new(task="Read a file")
+
+        chunks = [chunk async for chunk in stream_chat_with_agent_sdk(task, "Read a.txt", session_id="session-1")]
+
+        output = "".join(chunks)
+        assert output.endswith("Done. Bye.")
+        assert output.index("🔄 read_file (executing...)") < output.index("✅ read_file (completed)") < output.index("Done.")
+        tracker = agent_tracker.get_tracker(str(task.id), "session-1")
+        assert [call.tool_name for call in tracker.tool_calls] == ["read_file", "read_file"]
+        assert tracker.tool_calls[0].parameters == {"path": "a.txt"}
+
+    @pytest.mark.asyncio
+    async def test_partial_text_is_streamed_once(self, adk_events):
+        """Partial deltas are yielded as they arrive and the closing full text is not repeated."""
+        adk_events.extend([
+            model_event(types.Part(text="Hel"), partial=True),
+            model_event(types.Part(text="lo"), partial=True),
+            model_event(types.Part(text="Hello")),
+        ])
+        task = Task.create_new(task="Say hello")
+
+        chunks = [chunk async for chunk in stream_chat_with_agent_sdk(task, "Hi", session_id="session-1")]
+
+        assert "".join(chunks) == "Hello"
+
+    @pytest.mark.asyncio
+    async def test_empty_final_response_reports_completion(self, adk_events):
+        """A final event without visible text still tells the user the task is complete."""
+        adk_events.append(model_event(types.Part(text=""), types.Part(text=" \n")))
+        task = Task.create_new(task="Do something")
+
+        chunks = [chunk async for chunk in stream_chat_with_agent_sdk(task, "Go", session_id="session-1")]
+
+        assert "".join(chunks).endswith("✅ Task completed.")
+
+    @pytest.mark.asyncio
+    async def test_run_ending_without_final_event_reports_completion(self, adk_events):
+        """A run that stops after tool calls still closes the stream with the completion note."""
+        adk_events.append(
+            model_event(types.Part(function_call=types.FunctionCall(name="read_file", args={"path": "a.txt"})))
+        )
+        task = Task.create_new(task="Do something")
+
+        chunks = [chunk async for chunk in stream_chat_with_agent_sdk(task, "Go", session_id="session-1")]
+
+        output = "".join(chunks)
+        assert "🔄 read_file (executing...)" in output
+        assert output.endswith("✅ Task completed.")
+
+
+async def chunk_source(*items):
+    """Yields strings, sleeping for the given number of seconds on float items."""
+    for item in items:
+        if isinstance(item, float):
+            await asyncio.sleep(item)
+        else:
+            yield item
+
+
+class TestStreamChatResponse:
+
+    @pytest.mark.asyncio
+    async def test_turn_is_saved_in_background(self, monkeypatch):
+        """The reply is streamed first and written to the workspace history afterwards."""
+        async def router(task, user_message, session_id):
+            yield "Hel"
+            yield "lo"
+
+        manager = MagicMock()
+        monkeypatch.setattr(chat_agent, "get_router_stream", lambda: router)
+        monkeypatch.setattr(chat_agent, "get_workspace_manager", lambda: manager)
+        task = Task.create_new(task="Build a site")
+
+        chunks = [chunk async for chunk in stream_chat_response(task, "Hi", session_id="session-1")]
+        await asyncio.gather(*chat_agent._pending_session_saves)
+
+        assert chunks == ["Hel", "lo"]
+        manager.save_session.assert_called_once_with(
+            task_id=task.id, user_message="Hi", agent_response="Hello", session_id="session-1"
+        )
+        assert not chat_agent._pending_session_saves
+
+
+class TestCoalesceStream:
+
+    @pytest.mark.asyncio
+    async def test_chunks_within_window_are_joined(self):
+        """Chunks arriving close together are sent as one batch, later ones as another."""
+        source = chunk_source("a", "b", "c", 0.2, "d")
+
+        batches = [batch async for batch in coalesce_stream(source, window_seconds=0.05)]
+
+        assert batches == ["abc", "d"]
+
+    @pytest.mark.asyncio
+    async def test_steady_stream_is_flushed_every_window(self):
+        """Chunks that keep arriving faster than the window are not held back until the size limit."""
+        source = chunk_source(*["x", 0.02] * 10)
+
+        batches = [batch async for batch in coalesce_stream(source, window_seconds=0.05)]
+
+        assert "".join(batches) == "x" * 10
+        assert len(batches) > 1
+
+    @pytest.mark.asyncio
+    async def test_batch_is_flushed_at_size_limit(self):
+        """A batch is sent as soon as it reaches max_chars, without waiting for the window."""
+        source = chunk_source("aa", "bb", "cc")
+
+        batches = [batch async for batch in coalesce_stream(source, window_seconds=1.0, max_chars=4)]
+
+        assert batches == ["aabb", "cc"]
+
+    @pytest.mark.asyncio
+    async def test_source_error_is_raised_after_buffered_output(self):
+        """Output buffered before a failure is still delivered before the error propagates."""
+        async def failing_source():
+            yield "partial"
+            raise RuntimeError("boom")
+
+        batches = []
+        with pytest.raises(RuntimeError, match="boom"):
+            async for batch in coalesce_stream(failing_source()):
+                batches.append(batch)
+
+        assert batches == ["partial"]
+
+    @pytest.mark.asyncio
+    async def test_closing_the_stream_stops_a_blocked_producer(self, monkeypatch):
+        """A client that stops reading does not leave the producer waiting on a full queue."""
+        monkeypatch.setattr(chat_agent, "STREAM_QUEUE_MAX_CHUNKS", 1)
+        produced = []
+
+        async def endless_source():
+            while True:
+                produced.append(len(produced))
+                yield "x"
+
+        stream = coalesce_stream(endless_source(), window_seconds=0.01, max_chars=1)
+        assert await stream.__anext__() == "x"
+        await stream.aclose()
+        count = len(produced)
+        await asyncio.sleep(0.05)
+
+        assert len(produced) == count
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+class TestToolResultPreview:
+
+    def test_short_result_matches_str(self):
+        """Small results are shown exactly as str() would show them."""
+        assert format_tool_result_preview({"result": "ok"}) == str({"result": "ok"})
+        assert format_tool_result_preview(None) == "No response"
+
+    def test_long_result_is_truncated(self):
+        """Large payloads are cut to the preview length."""
+        preview = format_tool_result_preview({"result": "x" * 50_000})
+
+        assert len(preview) <= chat_agent.TOOL_RESULT_PREVIEW_CHARS
+        assert preview.startswith("{'result': 'xxx")
+
+
+class TestCreateWorkspaceForTask:
+
+    @pytest.mark.asyncio
+    async def test_workspace_is_created_once_per_task(self, monkeypatch):
+        """Later messages of a task reuse the workspace path without touching the disk."""
+        manager = MagicMock()
+        manager.create_or_get_workspace.side_effect = lambda task_id: f"/workspaces/task_{task_id}"
+        monkeypatch.setattr(chat_agent, "get_workspace_manager", lambda: manager)
+        monkeypatch.setattr(chat_agent, "_workspace_paths", OrderedDict())
+
+        paths = [await create_workspace_for_task("task-1") for _ in range(3)]
+
+        assert paths == ["/workspaces/task_task-1"] * 3
+        manager.create_or_get_workspace.assert_called_once_with("task-1")
+
+
+class TestGetEnhancedInstruction:
+
+    def test_language_instruction_is_prepended(self, monkeypatch):
+        """The language instruction leads the prompt and is omitted for English."""
+        manager = MagicMock()
+        manager.get_context_summary.return_value = "# Workspace Context"
+        monkeypatch.setattr(chat_agent, "get_workspace_manager", lambda: manager)
+        task = Task.create_new(task="Build a site")
+
+        localized = get_enhanced_instruction(task, "/workspace", "RESPOND IN ru")
+        english = get_enhanced_instruction(task, "/workspace")
+
+        assert localized == "RESPOND IN ru\n\n" + english
+        assert english.startswith("You are an advanced AI assistant")
+        assert "**Your Workspace**: /workspace" in english
+        assert "- Description: Build a site" in english
+
+
+class TestGetSessionInstruction:
+
+    @pytest.fixture
+    def context_summary(self, monkeypatch):
+        """Serve a workspace context that tests can change between turns."""
+        manager = MagicMock()
+        manager.get_context_summary.return_value = "# Context v1"
+        monkeypatch.setattr(chat_agent, "get_workspace_manager", lambda: manager)
+        return manager.get_context_summary
+
+    @pytest.mark.asyncio
+    async def test_instruction_is_frozen_for_the_session(self, context_summary):
+        """Later turns reuse the first instruction even after the workspace context changed."""
+        task = Task.create_new(task="Build a site")
+        first = await get_session_instruction(task, "session-1", "/workspace")
+
+        context_summary.return_value = "# Context v2"
+
+        assert await get_session_instruction(task, "session-1", "/workspace") is first
+        assert "# Context v2" in await get_session_instruction(task, "session-2", "/workspace")
+        assert "# Context v2" in await get_session_instruction(task, "session-1", "/workspace", "RESPOND IN ru")
+
+    @pytest.mark.asyncio
+    async def test_message_without_language_keeps_session_language(self, context_summary):
+        """A default-language message does not replace the localized session instruction."""
+        task = Task.create_new(task="Build a site")
+        localized = await get_session_instruction(task, "session-1", "/workspace", "RESPOND IN ru")
+
+        assert await get_session_instruction(task, "session-1", "/workspace") is localized
+        context_summary.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_task_edit_rebuilds_instruction(self, context_summary):
+        """A changed task text or state is not served from the frozen instruction."""
+        task = Task.create_new(task="Build a site")
+        first = await get_session_instruction(task, "session-1", "/workspace")
+
+        task.short_description = "Build an online shop"
+        edited = await get_session_instruction(task, "session-1", "/workspace")
+        task.state = TaskState.CONTEXT_GATHERING
+        moved = await get_session_instruction(task, "session-1", "/workspace")
+
+        assert "- Description: Build a site" in first
+        assert "- Description: Build an online shop" in edited
+        assert f"- State: {TaskState.CONTEXT_GATHERING.value}" in moved
+        assert await get_session_instruction(task, "session-1", "/workspace") is moved
+
+    @pytest.mark.asyncio
+    async def test_reset_session_rebuilds_instruction(self, context_summary):
+        """Forgetting a session drops its instruction, so the next turn sees the new context."""
+        task = Task.create_new(task="Build a site")
+        await get_session_instruction(task, "session-1", "/workspace")
+
+        context_summary.return_value = "# Context v2"
+        forget_session(task.id, "session-1")
+
+        assert "# Context v2" in await get_session_instruction(task, "session-1", "/workspace")
+
+
+class TestFormatTaskDetails:
+
+    def test_only_present_fields_are_listed(self):
+        """Empty fields are left out of the task lines."""
+        assert format_task_details("Build a site", None, "1. New") == "\n- Task: Build a site\n- State: 1. New"
+        assert format_task_details(None, None, None) == ""
+
+
+class TestFormatChatError:
+
+    def test_known_errors_get_friendly_messages(self):
+        """Known failure markers map to fixed messages, anything else is passed through."""
+        assert "session has expired" in format_chat_error(ValueError("Session not found: s-1"))
+        assert "Authentication failed" in format_chat_error(RuntimeError("401 Unauthorized"))
+        assert format_chat_error(RuntimeError("boom")) == "⚠️ Error: boom"
+
+
+class TestBuildUserContent:
+
+    def test_content_matches_a_freshly_built_message(self):
+        """Cloned templates produce the same content and never share their parts list."""
+        first = build_user_content("Hello")
+        second = build_user_content("Bye")
+
+        assert first == types.Content(role="user", parts=[types.Part(text="Hello")])
+        assert second.parts[0].text == "Bye"
+        assert first.parts is not second.parts
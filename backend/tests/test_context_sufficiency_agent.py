@@ -0,0 +1,102 @@
+# backend/tests/test_context_sufficiency_agent.py
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from src.ai_agents import context_sufficiency_agent
+from src.ai_agents.context_sufficiency_agent import analyze_context_sufficiency
+from src.model.context import UserAnswer
+from src.model.task import Task
+
+
+@pytest.fixture
+def mock_runner(monkeypatch):
+    """Replace the Agents SDK runner so no request leaves the test."""
+    runner = MagicMock()
+    runner.run = AsyncMock()
+    monkeypatch.setattr(context_sufficiency_agent, "Runner", runner)
+    return runner
+
+
+class TestContextSufficiencyAgent:
+
+    @pytest.mark.asyncio
+    async def test_short_request_returns_fallback_questions(self, mock_runner):
+        """A short request without any context is answered without calling the LLM."""
+        task = Task.create_new(task="Сделать сайт")
+
+        result = await analyze_context_sufficiency(task)
+
+        assert result.is_context_sufficient is False
+        assert len(result.questions) == 3
+        assert result.questions[0].question == "Какую главную цель вы хотите достичь?"
+        mock_runner.run.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_answered_detailed_request_is_sufficient(self, mock_runner):
+        """Enough answers on a detailed request skip the LLM round-trip."""
+        task = Task.create_new(task=" ".join(["word"] * 50))
+        task.context_answers = [UserAnswer(question=f"Q{i}", answer=f"A{i}") for i in range(3)]
+
+        result = await analyze_context_sufficiency(task)
+
+        assert result.is_context_sufficient is True
+        assert result.questions == []
+        mock_runner.run.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_regular_request_calls_agent(self, mock_runner):
+        """Requests that are neither trivial nor fully answered still go to the LLM."""
+        task = Task.create_new(task="Build a web scraper that collects daily prices from three online shops")
+        mock_runner.run.return_value.final_output = MagicMock()
+
+        result = await analyze_context_sufficiency(task, iteration_count=2)
+
+        mock_runner.run.assert_awaited_once()
+        agent, message = mock_runner.run.await_args.args
+        assert agent is context_sufficiency_agent.context_sufficiency_agent
+        assert "ITERATION COUNT: 2" in message
+        assert "MAX QUESTIONS: 3" in message
+        assert result is mock_runner.run.return_value.final_output
+
+    @pytest.mark.asyncio
+    async def test_prompt_keeps_only_recent_answers(self, mock_runner, monkeypatch):
+        """Only the latest answers are included in the message sent to the LLM."""
+        monkeypatch.setattr(context_sufficiency_agent, "MAX_CONTEXT_ANSWERS_IN_PROMPT", 2)
+        task = Task.create_new(task="Build a web scraper that collects daily prices from three online shops")
+        task.context_answers = [UserAnswer(question=f"Q{i}", answer="") for i in range(4)]
+
+        await analyze_context_sufficiency(task)
+
+        _, message = mock_runner.run.await_args.args
+        assert "Q: Q1" not in message
+        assert "Q: Q2\nA: \nQ: Q3\nA: " in message
+
+    @pytest.mark.asyncio
+    async def test_detailed_chinese_request_calls_agent(self, mock_runner):
+        """Requests without spaces are measured in characters, not as a single word."""
+        task = Task.create_new(task="我想为我们的小型销售团队开发一个客户关系管理系统，用于跟踪潜在客户、记录每次沟通并自动提醒后续跟进。")
+        mock_runner.run.return_value.final_output = MagicMock()
+
+        result = await analyze_context_sufficiency(task)
+
+        mock_runner.run.assert_awaited_once()
+        assert result is mock_runner.run.return_value.final_output
+
+    @pytest.mark.asyncio
+    async def test_short_request_without_localized_questions_calls_agent(self, mock_runner):
+        """Languages without fallback questions get questions from the LLM in their own language."""
+        task = Task.create_new(task="Crear una tienda en línea")
+        mock_runner.run.return_value.final_output = MagicMock()
+
+        await analyze_context_sufficiency(task)
+
+        mock_runner.run.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_short_chinese_request_calls_agent(self, mock_runner):
+        """A short request in a language without fallback questions still goes to the LLM."""
+        task = Task.create_new(task="做一个网站")
+        mock_runner.run.return_value.final_output = MagicMock()
+
+        await analyze_context_sufficiency(task)
+
+        mock_runner.run.assert_awaited_once()
@@ -0,0 +1,14 @@
+# backend/tests/test_llm.py
+from src.ai_agents.llm import get_llm
+
+
+class TestGetLlm:
+
+    def test_wrapper_is_shared_per_model(self):
+        """Agents built for the same model reuse a single LiteLlm wrapper."""
+        first = get_llm("openai/test-model")
+
+        assert get_llm("openai/test-model") is first
+        assert get_llm("openai/other-model") is not first
+        assert first.model == "openai/test-model"
+